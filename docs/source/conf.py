@@ -18,12 +18,29 @@ release = '1.0'
 import os
 import os.path as osp
 import fnmatch
+import functools
+import json
+import re
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader # LibYAML bindings
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
 # adapted from: https://github.com/abey79/vsketch
 
-root_src = osp.join(osp.abspath('../../'))
+# hooks run after sphinx has left the configuration directory, so paths are
+# resolved against this file rather than the working directory.
+conf_dir = osp.dirname(osp.abspath(__file__))
+
 
+def get_root_src():
+    """Returns the root of the repository."""
+    return osp.dirname(osp.dirname(conf_dir))
+
+# all extensions below are parallel read/write safe, so the docs can be built
+# with `sphinx-build -j auto` (see SPHINXOPTS in docs/Makefile).
 extensions = [
     "sphinx.ext.napoleon",
     "sphinx.ext.doctest",
@@ -34,8 +51,9 @@ extensions = [
     "nbsphinx"
 ]
 
-# debug: never to avoid re-executing the notebooks
-nbsphinx_execute="always" # auto|always|never
+# auto: only execute notebooks without stored outputs. CI can force a full
+# re-execution with NBSPHINX_EXECUTE=always.
+nbsphinx_execute = os.environ.get("NBSPHINX_EXECUTE", "auto") # auto|always|never
 nbsphinx_allow_errors = False
 
 doctest_global_setup = '''
@@ -48,7 +66,10 @@ templates_path = ['_templates']
 
 # Don't mess with double-dash used in CLI options
 smartquotes_action = "qe"
-exclude_patterns = ["_build", "Thumbs.db", ".DS_Store", "venv", ".*", "notebooks_/.pytest_cache/README.md"]
+# hidden entries are excluded at any depth: sphinx prunes a matching directory
+# (e.g. .pytest_cache, .ipynb_checkpoints) instead of matching every file in
+# it. Exclusions only apply to sources, so html_static_path is not affected.
+exclude_patterns = ["_build", "Thumbs.db", ".DS_Store", "venv", ".*", "**/.*"]
 
 
 # -- Options for HTML output -------------------------------------------------
@@ -71,7 +92,8 @@ napoleon_use_param = True
 
 
 # -- autoapi configuration ---------------------------------------------------
-autoapi_dirs = [osp.join(root_src, 'heterograph')]
+# set by init_autoapi_dirs() once the configuration is loaded
+autoapi_dirs = []
 autoapi_type = "python"
 autoapi_member_order = "bysource"
 # debug: keep rst files
@@ -82,12 +104,15 @@ autoapi_options= [
     'show-inheritance',
     'show-module-summary',
     "imported-members",
-    "private-members",
-    "special-members"
-    'show-inheritance-diagram']
+    "private-members"]
 
 autoapi_ignore = ['*tests*']
 
+# sources are parsed statically: heterograph is a regular package whose
+# __all__ is a literal, so neither namespace discovery nor imports are needed.
+autoapi_python_use_implicit_namespaces = False
+autoapi_own_page_level = "module"
+
 autoapi_template_dir= '_templates/autoapi'
 
 # -- custom auto_summary() macro ---------------------------------------------
@@ -100,6 +125,10 @@ def contains(seq, item):
     {% set class_methods = methods|selectattr("properties", "contains", "classmethod") %}
 
     Related doc: https://jinja.palletsprojects.com/en/3.1.x/api/#custom-tests
+
+    Membership is delegated to the container: sets and dicts are O(1). Lists
+    are deliberately not converted, since building a frozenset on every call
+    costs as much as the linear scan it replaces.
     """
     return item in seq
 
@@ -109,8 +138,22 @@ def prepare_jinja_env(jinja_env) -> None:
     """Add `contains` custom test to Jinja environment."""
     jinja_env.tests["contains"] = contains
 
-    def print_attributes(obj):
-        print(f"{obj.type}")
+    # templates do not change during a build: compile each template once and
+    # serve it from the environment cache without checking its mtime.
+    jinja_env.auto_reload = False
+
+    # persist compiled templates across builds
+    from jinja2 import FileSystemBytecodeCache
+    cache_dir = osp.join(conf_dir, ".jinja_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=cache_dir)
+
+    if os.environ.get("HETEROGRAPH_DOCS_DEBUG"):
+        def print_attributes(obj):
+            print(f"{obj.type}")
+    else:
+        # debug only: avoid writing to stdout for every rendered object
+        print_attributes = lambda obj: ""
 
     jinja_env.filters["print_attributes"] = print_attributes
 
@@ -128,14 +171,48 @@ html_css_files = [
     "css/label.css",
 ]
 
-with open("api-filter.yml", 'r') as file:
-    filters = yaml.safe_load(file)
+def _load_filters(yml_path=osp.join(conf_dir, "api-filter.yml"),
+                  json_path=osp.join(conf_dir, "api-filter.json")):
+    """Loads the AutoAPI filters.
 
+    The parsed YAML is cached in a JSON sidecar, which is reused as long as it
+    is not older than the YAML file.
+    """
+    yml_mtime = os.stat(yml_path).st_mtime
+    try:
+        if os.stat(json_path).st_mtime >= yml_mtime:
+            with open(json_path, 'r') as file:
+                return json.load(file)
+    except (OSError, ValueError):
+        pass # missing or corrupt cache: regenerate it
 
-def autoapi_skip_members(app, what, name, obj, skip, options):
-    if (filters is not None) and (what in filters):
-        _filters_what = filters[what]
-        for incl in _filters_what:
+    with open(yml_path, 'r') as file:
+        filters = yaml.load(file, Loader=_YAMLLoader)
+
+    try:
+        with open(json_path, 'w') as file:
+            json.dump(filters, file)
+    except OSError:
+        pass # read-only source tree: run without cache
+
+    return filters
+
+
+
+def _compile_filters(filters):
+    """Compiles the patterns of each member type into a single regex.
+
+    Each pattern is captured by a named group mapped to its skip decision.
+    Alternatives are tried in order, so the first matching pattern wins.
+    """
+    compiled = { }
+    if filters is None:
+        return compiled
+
+    for what, patterns in filters.items():
+        groups = []
+        skip_on_match = { }
+        for i, incl in enumerate(patterns):
             if incl[0] == '+':
                 incl = incl[1:]
                 if_match_skip = False
@@ -144,14 +221,47 @@ def autoapi_skip_members(app, what, name, obj, skip, options):
                 if_match_skip = True
             else:
                 if_match_skip = True
-            if fnmatch.fnmatch(name, incl):
-                return if_match_skip
-        return False
+            group = "f%d" % i
+            groups.append("(?P<%s>%s)" % (group, fnmatch.translate(incl)))
+            skip_on_match[group] = if_match_skip
+        compiled[what] = (re.compile("|".join(groups)), skip_on_match)
+
+    return compiled
+
+
+@functools.cache
+def get_compiled_filters():
+    """Loads and compiles the AutoAPI filters on first use."""
+    return _compile_filters(_load_filters())
+
+
+@functools.lru_cache(maxsize=None)
+def _skip_member(what, name):
+    """Decides whether a member is skipped. Only depends on `what` and `name`."""
+    compiled_filters = get_compiled_filters()
+    if what in compiled_filters:
+        (regex, skip_on_match) = compiled_filters[what]
+        match = regex.match(name)
+        if match is not None:
+            return skip_on_match[match.lastgroup]
 
     return False
 
 
+def autoapi_skip_members(app, what, name, obj, skip, options):
+    return _skip_member(what, name)
+
+
+def init_autoapi_dirs(app, config):
+    config.autoapi_dirs = [osp.join(get_root_src(), 'heterograph')]
+
+
 def setup(app):
+    app.connect("config-inited", init_autoapi_dirs)
     app.connect("autoapi-skip-member", autoapi_skip_members)
 
+    # the skip hook is a pure function of its arguments, so it is safe to run
+    # from parallel reader/writer processes.
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
+
 
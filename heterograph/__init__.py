@@ -1,9 +1,25 @@
 """This package implements the Heterograph API."""
 
-from .webview import WebView
-from .hgraph import HGraph
-from .query.rsutils import RSet
+import importlib
 
-# workaround for sphonx-autoapi to avoid duplicates.
-__all__ = []
-__all__.extend(['HGraph', 'WebView', 'RSet'])
+# public names => defining submodule. Submodules are only imported on first
+# access (PEP 562), so `import heterograph` does not pull in flask/graphviz.
+_exports = {
+    'HGraph': '.hgraph',
+    'WebView': '.webview',
+    'RSet': '.query.rsutils',
+}
+
+# also prevents sphinx-autoapi from documenting duplicates.
+__all__ = ['HGraph', 'WebView', 'RSet']
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value # next accesses bypass __getattr__
+    return value
+
+def __dir__():
+    return sorted([*globals(), *__all__])
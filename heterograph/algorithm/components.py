@@ -0,0 +1,37 @@
+import graph_tool.topology as gt
+
+def connected_components(g):
+   """
+   Returns the (weakly) connected components of the graph `g`, ignoring edge directions. Labelling is performed by graph-tool in a single pass over the internal graph.
+
+   Args:
+      g (HGraph): The graph to partition.
+
+   Returns:
+      list: A list of components, each represented as a list of vertices. Components are ordered by their first vertex, and vertices follow the order of `g.vertices`.
+
+   Example:
+      >>> from heterograph.algorithm.components import connected_components
+      >>> from heterograph import *
+      >>> g = HGraph()
+      >>> g.add_vx(5)
+      [0, 1, 2, 3, 4]
+      >>> g.add_edge(0, 1)
+      [(0, 1)]
+      >>> g.add_edge([2, 4], 3)
+      [(2, 3), (4, 3)]
+      >>> connected_components(g)
+      [[0, 1], [2, 3, 4]]
+   """
+   if g.num_vx == 0:
+      return []
+
+   (comp, _) = gt.label_components(g.igraph, directed=False)
+   labels = comp.a
+   to_ivx = g.to_ivx
+
+   components = { } # label => [vx0, vx1, ...]
+   for vx in g.vertices:
+      components.setdefault(int(labels[to_ivx[vx]]), []).append(vx)
+
+   return list(components.values())
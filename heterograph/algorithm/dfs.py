@@ -31,23 +31,26 @@ def get_paths(g, vs=None):
       >>> get_paths(g, vs=[0, 2])
       [[0, 1, 2, 4], [0, 1, 3, 4], [2, 4]]
    """
-   class GetPath:
-      @staticmethod
-      def pre(g, vx, path, data):
-         data.last_pre_vx = vx
-
-      @staticmethod
-      def post(g, vx, path, data):
-         # leaf!
-         if data.last_pre_vx == vx:
-            data.paths.append(path+[vx])
-
-      def __init__(self, g, vs=None):
-         self.paths=[]
-         dfs_visitor(g, vs, pre=GetPath.pre, post=GetPath.post, data=self)
-
-   gp = GetPath(g, vs)
-   return gp.paths
+   # paths from a vertex are shared by all paths reaching it (e.g. diamonds),
+   # so they are enumerated once per vertex
+   paths_from = {}
+
+   def __paths(vx):
+      paths = paths_from.get(vx)
+      if paths is None:
+         out_vs = g.out_vx(vx)
+         if out_vs:
+            paths = [ (vx,) + path for c_vx in out_vs for path in __paths(c_vx) ]
+         else:
+            # leaf!
+            paths = [ (vx,) ]
+         paths_from[vx] = paths
+      return paths
+
+   if vs is None:
+      vs = g.source
+
+   return [ list(path) for vx in vs for path in __paths(vx) ]
 
 def dfs_visitor(g, vs=None, pre=None, post=None, data=None):
    """
@@ -1,17 +1,76 @@
 import graph_tool as gt
+import graphviz
 from graphviz import Digraph
-import itertools
+import numpy as np
 import copy
+import functools
 import sys
-from heterograph.algorithm.dfs import dfs_traversal
 from heterograph.hgraph_props import HGraphProps
-import wrapt
 
-@wrapt.decorator
-def modifies_graph(wrapped, instance, args, kwargs):
-    if instance.read_only:
-        raise RuntimeError("cannot modify read-only graph!")
-    return wrapped(*args, **kwargs)
+def modifies_graph(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if self.read_only:
+            raise RuntimeError("cannot modify read-only graph!")
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            self._clear_cache()
+    return wrapper
+
+# Graphviz output of recently piped renders, keyed by (DOT source, format, options):
+# rendering an unchanged graph again does not spawn another Graphviz process
+_pipe_cache = { }
+_PIPE_CACHE_SIZE = 32
+
+def _pipe_key(vg, format, kwargs):
+    return (vg.source, format, tuple(sorted(kwargs.items())))
+
+def _pipe_cache_put(key, out):
+    if len(_pipe_cache) >= _PIPE_CACHE_SIZE:
+        _pipe_cache.pop(next(iter(_pipe_cache)), None) # oldest entry
+    _pipe_cache[key] = out
+
+def _pipe(vg, format, kwargs):
+    key = _pipe_key(vg, format, kwargs)
+    out = _pipe_cache.get(key, None)
+    if out is None:
+        out = vg.pipe(format=format, **kwargs)
+        _pipe_cache_put(key, out)
+    return out
+
+_SVG_HEADER = b'<?xml '
+
+def _pipe_batch(jobs):
+    """
+    Renders several piped SVG renders (`jobs` are the arguments of `_pipe`) with a single Graphviz process per
+    layout engine, since process startup dominates the rendering time of small graphs. Returns the output of
+    each job, or None for jobs that could not be batched (other formats or options), which must be piped individually.
+    """
+    outs = [ None ] * len(jobs)
+    batches = { }
+    for (i, (vg, format, kwargs)) in enumerate(jobs):
+        out = _pipe_cache.get(_pipe_key(vg, format, kwargs), None)
+        if out is not None:
+            outs[i] = out
+        elif format == 'svg' and not kwargs:
+            batches.setdefault((vg.engine, vg.encoding), []).append(i)
+
+    for ((engine, encoding), batch) in batches.items():
+        if len(batch) < 2:
+            continue
+        data = ''.join(jobs[i][0].source for i in batch).encode(encoding)
+        try:
+            svgs = graphviz.pipe(engine, 'svg', data)
+        except graphviz.CalledProcessError:
+            continue # a faulty graph fails the whole batch: leave errors to the individual renders
+        svgs = [ _SVG_HEADER + svg for svg in svgs.split(_SVG_HEADER)[1:] ]
+        if len(svgs) != len(batch):
+            continue
+        for (i, out) in zip(batch, svgs):
+            outs[i] = out
+            _pipe_cache_put(_pipe_key(*jobs[i]), out)
+    return outs
 
 
 
@@ -35,6 +94,12 @@ class HGraph:
     - **Rendering and Viewing**: The class provides methods for rendering the graph into different formats (like SVG) and viewing it directly on a webpage through a built-in HTTP server with interactive features.
 
     """
+
+    # fixed set of attributes: no per-instance __dict__ (private names are mangled)
+    __slots__ = ('__g', '__ginit', '__vinit', '__einit', '__vx_counter', '__ivx', '__vx',
+                 '__in', '__out', '__sources', '__sinks', '__edge_set', '__properties',
+                 '__cache', '__version', 'read_only', '__gstyle', '__vstyle', '__estyle')
+
     def __init__(self, *, ginit=None, vinit=None, einit=None):
         """Initializes an instance of HGraph.
 
@@ -78,10 +143,25 @@ class HGraph:
         self.__out = None
         """dictionary that stores outgoing neighbors of each vertex."""
 
+        self.__sources = None
+        """set of vertices with no incoming edges."""
+
+        self.__sinks = None
+        """set of vertices with no outgoing edges."""
+
+        self.__edge_set = None
+        """set of edges (vx0, vx1), used for fast edge lookups."""
+
         # graph map properties
         self.__properties = None
         """an instance of HGraphProps that manages property maps for graph, vertices and edges."""
 
+        self.__cache = None
+        """cached result of :attr:`edges`, cleared whenever the graph is modified."""
+
+        self.__version = 0
+        """modification counter, incremented whenever the cache is cleared."""
+
         self.read_only = None
         """indicates whether the graph is in read-only mode. If True, any graph modification raises an error."""
 
@@ -203,18 +283,25 @@ class HGraph:
         """
         return [*self.__ivx]
 
+    @property
+    def version(self):
+        """
+        This property returns a counter that is incremented whenever the graph is modified. It can be used to tell whether data derived from the graph is out of date.
+        """
+        return self.__version
+
     @property
     def source(self):
         """
         Get list of source vertices (vertices with no incoming edges) in the graph.
         """
-
-        return [v for v in self.vertices if len(self.in_vx(v)) == 0]
+        # vertex IDs are issued in increasing order, thus sorting preserves the order of `vertices`
+        return sorted(self.__sources)
 
     @property
     def sink(self):
         """Get list of sink vertices (vertices with no outgoing edges) in the graph."""
-        return [v for v in self.vertices if len(self.out_vx(v)) == 0]
+        return sorted(self.__sinks)
 
 
     def num_in_vx(self, vx):
@@ -377,27 +464,27 @@ class HGraph:
             raise ValueError("[x] 'n' must be >= 1!")
 
 
-        ivs = self.__g.add_vertex(n)
-
         if n == 1:
-            _ivs = [ivs]
-        else:
-            _ivs = ivs
+            # fast path: single vertex
+            return self.__new_vx(int(self.__g.add_vertex(1)))
 
-        ret = []
-        for _ivx in _ivs:
-            ivx = int(_ivx)
-            vx = self.__gen_vx_id()
+        # new internal IDs are contiguous, after the existing vertices
+        self.__g.add_vertex(n)
+        ivs = range(self.num_vx - n, self.num_vx)
+        vs = range(self.__vx_counter, self.__vx_counter + n)
+        self.__vx_counter = self.__vx_counter + n
 
-            self.__ivx[vx] = ivx
-            self.__vx[ivx] = vx
+        self.__ivx.update(zip(vs, ivs))
+        self.__vx.update(zip(ivs, vs))
 
-            ret.append(vx)
+        self.__sources.update(vs)
+        self.__sinks.update(vs)
 
-            if self.__vinit:
+        if self.__vinit:
+            for vx in vs:
                 self.__vinit(self, vx)
 
-        return ret if n > 1 else ret[0]
+        return list(vs)
 
     @modifies_graph
     def rm_vx(self, vs, verify=True):
@@ -431,7 +518,7 @@ class HGraph:
             []
         """
 
-        if type(vs) == int:
+        if isinstance(vs, int):
             vs = [vs]
 
         if len(vs) == 0:
@@ -440,42 +527,55 @@ class HGraph:
 
         if not verify:
             # filter if not exist to avoid raising an exception in the next statement
-            vs = [ v for v in vs if self.check_vx(v, verify=False)]
+            vs = [ v for v in vs if v in self.__ivx ]
 
         ivs = self.__to_ivs(vs) # {ivx: vx}
 
-        # reverse order
-        for ivx in reversed(sorted(ivs)):
-            self.__g.remove_vertex(ivx)
-            vx = ivs[ivx]
-            del self.__ivx[vx]
-
-        # defragment
-        n = self.num_vx
-        m = n
-        for i in reversed(range(0, self.__vx_counter)):
-            if i in self.__ivx:
-                n = n - 1
-                self.__ivx[i] = n
-                self.__vx[n] = i
-            if i >= m:
-                self.__vx.pop(i, None)
+        # reverse order: graph-tool moves the last vertex into the removed slot, which
+        # therefore is never a vertex still to be removed
+        for ivx in sorted(ivs, reverse=True):
+            self.__g.remove_vertex(ivx, fast=True)
+            del self.__ivx[ivs[ivx]]
+
+            last = self.num_vx # internal ID of the moved vertex
+            if ivx != last:
+                moved_vx = self.__vx[last]
+                self.__ivx[moved_vx] = ivx
+                self.__vx[ivx] = moved_vx
+            del self.__vx[last]
 
         # bookkeeping
+        vs = set(vs)
+        rm_edges = [ ]
+        nb_out = set() # remaining vertices whose outputs were removed
+        nb_in = set()  # remaining vertices whose inputs were removed
         for vx in vs:
-            _in = self.__in.get(vx, None)
-            if _in:
-                for v in _in:
-                    self.__out[v].remove(vx)
-
-            _out = self.__out.get(vx, None)
-            if _out:
-                for v in _out:
-                    self.__in[v].remove(vx)
-            self.__in.pop(vx, None)
-            self.__out.pop(vx, None)
-
-            self.__properties.rm_elem(vx)
+            for v in self.__in.pop(vx, []):
+                rm_edges.append((v, vx))
+                if v not in vs:
+                    nb_out.add(v)
+            for v in self.__out.pop(vx, []):
+                rm_edges.append((vx, v))
+                if v not in vs:
+                    nb_in.add(v)
+
+        # single pass over each neighbour list (updated in place)
+        for v in nb_out:
+            _out = self.__out[v]
+            _out[:] = [ x for x in _out if x not in vs ]
+            if not _out:
+                self.__sinks.add(v)
+        for v in nb_in:
+            _in = self.__in[v]
+            _in[:] = [ x for x in _in if x not in vs ]
+            if not _in:
+                self.__sources.add(v)
+
+        self.__edge_set.difference_update(rm_edges)
+        self.__sources.difference_update(vs)
+        self.__sinks.difference_update(vs)
+
+        self.__properties.rm_elems(vs, rm_edges)
 
 
     def check_vx(self, vs, verify=False):
@@ -502,9 +602,18 @@ class HGraph:
             >>> g.check_vx(4)
             False
         """
-        if type(vs) == int:
-            vs = [vs]
-
+        if isinstance(vs, int):
+            # fast path: single vertex
+            if vs in self.__ivx:
+                return True
+            if verify:
+                raise RuntimeError("vertex '%d' is invalid!" % vs)
+            return False
+
+        if self.__ivx.keys() >= set(vs):
+            return True
+
+        # find the invalid vertex
         for _id in vs:
             if _id not in self.__ivx:
                 if verify:
@@ -525,7 +634,18 @@ class HGraph:
         """Returns a list of all edges as tuples (v1, v2) where each tuple represents an edge
         connecting vertex v1 and v2 in the graph instance. The vertices are identified by their integer IDs.
          """
-        return [ (self.__vx[int(e[0])], self.__vx[int(e[1])]) for e in self.__g.get_edges() ]
+        edges = self.__cache.get('edges', None)
+        if edges is None:
+            # internal vertex IDs are contiguous (see rm_vx), so ivx => vx is a lookup table
+            n = len(self.__vx)
+            lut = np.empty(n, dtype=np.int64)
+            lut[np.fromiter(self.__vx.keys(), dtype=np.int64, count=n)] = np.fromiter(self.__vx.values(), dtype=np.int64, count=n)
+            edges = lut[self.__g.get_edges()]
+            # rm_vx moves vertices between internal IDs: group edges by source vertex ID,
+            # keeping graph-tool's order for the edges of each source
+            edges = edges[np.argsort(edges[:, 0], kind='stable')]
+            edges = self.__cache['edges'] = [*map(tuple, edges.tolist())]
+        return edges.copy()
 
     @modifies_graph
     def add_edge(self, s, t):
@@ -563,41 +683,44 @@ class HGraph:
             >>> g.edges
             [(0, 1), (0, 2), (1, 0), (2, 0), (2, 3)]
         """
-        if type(s) == int:
+        if isinstance(s, int) and isinstance(t, int):
+            # fast path: single edge
+            self.check_vx(s, verify=True)
+            self.check_vx(t, verify=True)
+            if s == t or (s, t) in self.__edge_set:
+                return []
+            self.__g.add_edge(self.__ivx[s], self.__ivx[t], add_missing=False)
+            self.__new_edge(s, t)
+            return [(s, t)]
+
+        if isinstance(s, int):
             s = [s]
-        if type(t) == int:
+        if isinstance(t, int):
             t = [t]
 
+        # make sure s and t exist
+        self.check_vx(s, verify=True)
+        self.check_vx(t, verify=True)
+
         edges = []
+        added = set()
         for _s in s:
             for _t in t:
-                # make sure s and t exist
-                ivx_edge = list(self.__to_ivs([_s, _t]).keys())
-
-                # ignore self-loop
-                if _s == _t:
+                # ignore self-loops and existing edges
+                if _s == _t or (_s, _t) in self.__edge_set or (_s, _t) in added:
                     continue
-                # ignore existing edges
-                if self.__g.edge(ivx_edge[0], ivx_edge[1], add_missing=False) is not None:
-                    continue
-                self.__g.add_edge(ivx_edge[0], ivx_edge[1], add_missing=False)
-
-                vx_edge = (_s, _t)
-                edges.append(vx_edge)
+                added.add((_s, _t))
+                edges.append((_s, _t))
 
-                if self.__einit:
-                    self.__einit(self, vx_edge)
+        if not edges:
+            return edges
 
-                # bookkeeping
-                if _t not in self.__in:
-                    self.__in[_t] = [_s]
-                else:
-                    self.__in[_t].append(_s)
+        # insert all edges in a single call
+        ivx = self.__ivx
+        self.__g.add_edge_list(np.array([(ivx[e[0]], ivx[e[1]]) for e in edges], dtype=np.int64))
 
-                if _s not in self.__out:
-                    self.__out[_s] = [_t]
-                else:
-                    self.__out[_s].append(_t)
+        for (_s, _t) in edges:
+            self.__new_edge(_s, _t)
 
         return edges
 
@@ -631,27 +754,20 @@ class HGraph:
             >>> g.check_edge([(0, 1), (0, 4)])
             False
         """
-        if type(edge) == tuple:
+        if isinstance(edge, tuple):
             edges = [edge]
         else:
             edges = edge
 
+        ivx = self.__ivx
         for e in edges:
-
-            found = True
-
-            try:
-                [ev0, ev1] = self.__to_ivs([e[0], e[1]])
-            except RuntimeError:
-                found = False
-
-            if not found:
+            if e[0] not in ivx or e[1] not in ivx:
                 if verify:
                     raise RuntimeError("edge %s is invalid!" % str(e))
                 else:
                     return False
 
-            if self.__g.edge(ev0, ev1, add_missing=False) is None:
+            if (e[0], e[1]) not in self.__edge_set:
                 if verify:
                     raise RuntimeError("edge %s not found!" % str(e))
                 else:
@@ -687,7 +803,7 @@ class HGraph:
         Raises:
             RuntimeError: If `verify` is True and one or more edges are not found in the graph.
         """
-        if type(edge) == tuple:
+        if isinstance(edge, tuple):
             if len(edge) != 2:
                 raise RuntimeError("invalid edge: %s!" % str(edge))
             edges = [edge]
@@ -698,18 +814,23 @@ class HGraph:
             edges = [ e for e in edges if self.check_edge(e) ]
 
         g = self.__g
+        ivx = self.__ivx
         for e in edges:
             try:
-                [ev0, ev1] = self.__to_ivs([e[0], e[1]])
-            except RuntimeError as ex:
+                edge = g.edge(ivx[e[0]], ivx[e[1]], add_missing=False)
+            except KeyError as ex:
                 raise RuntimeError("edge descriptor not found: %s" % str(e)) from ex
 
-            edge = g.edge(ev0, ev1, add_missing=False)
             if edge:
                g.remove_edge(edge)
                # bookkeeping
                self.__in[e[1]].remove(e[0])
                self.__out[e[0]].remove(e[1])
+               self.__edge_set.discard((e[0], e[1]))
+               if not self.__in[e[1]]:
+                   self.__sources.add(e[1])
+               if not self.__out[e[0]]:
+                   self.__sinks.add(e[0])
 
                self.__properties.rm_elem(e)
 
@@ -774,6 +895,12 @@ class HGraph:
             [(0, 1)]
         """
 
+        if vs is None:
+            vs = self.vertices
+        else:
+            vs = list(vs)
+            self.check_vx(vs, verify=True)
+
         if g is None:
             g = HGraph(ginit=self.__ginit, vinit=self.__vinit, einit=self.__einit)
             # we need to set it to None, othrwise it will append to the existing style
@@ -786,23 +913,23 @@ class HGraph:
         # copy graph properties
         g.pmap = dict(self.__properties)
 
-
-        if vs is None:
-            vs = self.vertices
-
         _map = { } # vx(self) => vx (g)
-        for vx in vs:
-            _vx = g.add_vx(1)
-            _map[vx] = _vx
-            self.__properties.copy_prop_elem(g, _vx, vx)
+        if vs:
+            _vs = g.add_vx(len(vs))
+            _map = dict(zip(vs, _vs if isinstance(_vs, list) else [_vs]))
 
+        edges = [ ]
         if induced:
-            for e in self.edges:
-                _e0 = _map.get(e[0], None)
-                _e1 = _map.get(e[1], None)
-                if (_e0 is not None) and (_e1 is not None):
-                    g.add_edge(_e0, _e1)
-                    self.__properties.copy_prop_elem(g, (_e0, _e1), e)
+            edges = [ e for e in self.edges if e[0] in _map and e[1] in _map ]
+
+            # one call per source vertex
+            _out = { }
+            for e in edges:
+                _out.setdefault(_map[e[0]], []).append(_map[e[1]])
+            for (_s, _t) in _out.items():
+                g.add_edge(_s, _t)
+
+        self.__properties.copy_props(g, _map, edges)
 
         g.read_only = self.read_only
 
@@ -837,13 +964,17 @@ class HGraph:
             []
         """
 
-        def visit(g, vx, synth):
-           # flatten list
-           synth = list(itertools.chain(*synth))
-           synth.append(vx)
-           return synth
-        # vx is the root of the subgraph we wish to remove
-        vs = dfs_traversal(g=self, vx=vx, post=visit)
+        self.check_vx(vx, verify=True)
+
+        # vx is the root of the subgraph we wish to remove: collect every vertex
+        # reachable from it (rm_vx does not depend on the order)
+        vs = [vx]
+        visited = {vx}
+        for v in vs: # vs grows while being traversed
+            for w in self.__out.get(v, []):
+                if w not in visited:
+                    visited.add(w)
+                    vs.append(w)
         self.rm_vx(vs)
 
     def render(self, *, filename='graph.svg', format='svg', pipe=False, vs=None, induced=True, gstyle=None, vstyle=None, estyle=None, **kwargs):
@@ -854,7 +985,7 @@ class HGraph:
             filename (str, optional): The output filename. Defaults to 'graph.svg'.
             format (str, optional): The format of the generated images ('png', 'pdf', etc). Defaults to 'svg'.
             pipe (bool, optional): If True, return a string representation of the graph in specified format instead of saving an image file. Defaults to False.
-            vs (list of ints, optional): A list of vertex IDs specifying which vertices should be included in the rendering. If not provided, all vertices will be included. Defaults to None.
+            vs (list of ints, optional): A list of vertex IDs specifying which vertices should be included in the rendering. A frozenset is used as-is for membership tests, which avoids copying it on repeated renders. If not provided, all vertices will be included. Defaults to None.
             induced (bool, optional): Whether or not only the edges within the subgraph specified by `vs` should be rendered. Defaults to True.
             gstyle (dict, optional): The graph style as a dictionary where keys are property names and values are their new values. Defaults to None.
             vstyle (dict, optional): The vertex style as a dictionary where keys are property names and values are their new values. Defaults to None.
@@ -863,10 +994,33 @@ class HGraph:
 
         Returns:
             str or None:
-                * If `pipe` is True, returns a string representation of the graph in specified format.
+                * If `pipe` is True, returns a string representation of the graph in specified format. Outputs of recent renders are cached by DOT source, so piping an unchanged graph again does not invoke Graphviz.
                 * Otherwise (if `pipe` is False), no return value. The rendered image file will be saved to disk with the filename provided.
         """
 
+        vg = self.__digraph(vs=vs, induced=induced, gstyle=gstyle, vstyle=vstyle, estyle=estyle)
+
+        if pipe:
+            return _pipe(vg, format, kwargs)
+        else:
+            return vg.render(filename=filename, cleanup=True, format=format, **kwargs)
+
+    def _render_deferred(self, *, format='svg', vs=None, induced=True, gstyle=None, vstyle=None, estyle=None, **kwargs):
+        """
+        Private method. Captures the graph as it is now, and defers the Graphviz rendering. Used by :class:`WebView` to render graphs only when they are viewed.
+
+        Args:
+            Same as :meth:`render` with `pipe=True`.
+
+        Returns:
+            functools.partial: A function without arguments that returns the same output as :meth:`render` with `pipe=True` would have returned when this method was called. Its `args` can be passed to `_pipe_batch` to render several graphs at once.
+        """
+        vg = self.__digraph(vs=vs, induced=induced, gstyle=gstyle, vstyle=vstyle, estyle=estyle)
+        return functools.partial(_pipe, vg, format, kwargs)
+
+    def __digraph(self, *, vs, induced, gstyle, vstyle, estyle):
+        """Private method. Builds the Graphviz description of the graph (or part of the graph) for :meth:`render`."""
+
         # ==== cluster support ===
         # g.style['nclusters'] = 4
         # g.style['cluster'] = lambda g, c: {'label': 'abc'}
@@ -889,29 +1043,53 @@ class HGraph:
             # style_n
             return (style_n, style_w, style_c)
 
+        def split_styles(style_n, style_w):
+            # static attributes are resolved once; dynamic attributes (callable and/or
+            # wrapped) are evaluated per element as (attr, val, is_callable, wrapper)
+            static = { }; dynamic = [ ]
+            for (s, val) in style_n.items():
+                if callable(val) or s in style_w:
+                    dynamic.append((s, val, callable(val), style_w.get(s, None)))
+                elif val is not None:
+                    static[s] = val
+            return (static, dynamic)
+
+        def eval_styles(styles, *args):
+            (static, dynamic) = styles
+            if not dynamic:
+                # all-static styles: shared as-is, since callers unpack it with **
+                return static
+            sargs = dict(static)
+            for (s, val, is_callable, wrapper) in dynamic:
+                if is_callable:
+                    val = val(self, *args)
+                if val is not None and wrapper is not None:
+                    val = wrapper(self, *args, val)
+                if val is not None:
+                    sargs[s] = val
+            return sargs
+
         (_gstyle_n, _gstyle_w, _gstyle_c) = init_styles(self.__gstyle, gstyle)
         (_vstyle_n, _vstyle_w, _vstyle_c) = init_styles(self.__vstyle, vstyle)
         (_estyle_n, _estyle_w, _) = init_styles(self.__estyle, estyle)
 
+        _gstyles = split_styles(_gstyle_n, _gstyle_w)
+        _vstyles = split_styles(_vstyle_n, _vstyle_w)
+        _estyles = split_styles(_estyle_n, _estyle_w)
+
         if vs is None:
-            vs = set(self.vertices) # faster access
+            vs = self.vertices # rendered in insertion order
+        vs_set = vs if isinstance(vs, frozenset) else frozenset(vs) # membership tests
 
         vg = Digraph()
 
         # graph attributes
-        sargs = { }
-        for s in _gstyle_n:
-           val = _gstyle_n[s](self) if callable(_gstyle_n[s]) else _gstyle_n[s]
-           if val is not None:
-               if s in _gstyle_w:
-                   val = _gstyle_w[s](self, val)
-               if val is not None:
-                   sargs[s] = val
-        vg.attr('graph', **sargs)
+        vg.attr('graph', **eval_styles(_gstyles))
 
         ##### cluster support (graph)
         nclusters = int(_gstyle_c.get('nclusters', 0))
-        ## set cluster attribute
+        ## collect cluster attributes
+        cluster_attrs = { } # c => attributes
         if nclusters > 0 and 'cluster' in _gstyle_c:
             cattr_fn = _gstyle_c['cluster']
             if cattr_fn is not None:
@@ -919,47 +1097,43 @@ class HGraph:
                     ret = cattr_fn(self, int(c))
                     if type(ret) != dict:
                         raise RuntimeError("expecting cluster attributes inside a dictionary!")
-                    with vg.subgraph(name="cluster_%d" % c) as c:
-                        c.attr(**ret)
+                    cluster_attrs[c] = ret
+
+        ## cluster of each vertex
+        vcluster_fn = _vstyle_c.get('cluster', None) if nclusters > 0 else None
+        clusters = { } # c => [vx0, vx1, ...]
+
+        # vertex names are shared by nodes and edges
+        names = { v: str(v) for v in vs }
+        node = vg.node
 
         # vertex attributes
         for v in vs:
-            sargs = { }
-            for s in _vstyle_n:
-                val = _vstyle_n[s](self, v) if callable(_vstyle_n[s]) else _vstyle_n[s]
-                if val is not None:
-                    if s in _vstyle_w:
-                        val = _vstyle_w[s](self, v, val)
-                    if val is not None:
-                        sargs[s] = val
-            vg.node(str(v), **sargs)
+            node(names[v], **eval_styles(_vstyles, v))
 
             # cluster support
-            if nclusters > 0 and 'cluster' in _vstyle_c:
-                c = _vstyle_c['cluster'](self, v)
+            if vcluster_fn is not None:
+                c = vcluster_fn(self, v)
                 if c is not None:
-                   with vg.subgraph(name='cluster_%d' % int(c)) as c:
-                       c.node(str(v))
+                    clusters.setdefault(int(c), []).append(v)
+
+        # one subgraph per cluster
+        for c in dict.fromkeys([*cluster_attrs, *clusters]):
+            with vg.subgraph(name='cluster_%d' % c) as sg:
+                if c in cluster_attrs:
+                    sg.attr(**cluster_attrs[c])
+                for v in clusters.get(c, []):
+                    sg.node(names[v])
 
         # edge attributes
         if induced:
-            for e in self.edges:
-                if e[0] in vs and e[1] in vs:
-                    sargs = { }
-                    for s in _estyle_n:
-                        val = _estyle_n[s](self, e) if callable(_estyle_n[s]) else _estyle_n[s]
-                        if val is not None:
-                            if s in _estyle_w:
-                                val = _estyle_w[s](self, e, val)
-                            if val is not None:
-                                sargs[s] = val
-
-                    vg.edge(str(e[0]), str(e[1]), **sargs)
+            # only visit edges leaving vs: O(sum of out-degrees) instead of O(|E|)
+            edges = [ (v, w) for v in vs for w in self.__out.get(v, []) if w in vs_set ]
+            edge = vg.edge
+            for e in edges:
+                edge(names[e[0]], names[e[1]], **eval_styles(_estyles, e))
 
-        if pipe:
-            return (vg.pipe(format=format, **kwargs))
-        else:
-            return vg.render(filename=filename, cleanup=True, format=format, **kwargs)
+        return vg
 
 
     def view(self, host='0.0.0.0', port='8888', viewer=None, **kwargs):
@@ -1010,9 +1184,19 @@ class HGraph:
         # vx => [vx_out0, vx_out1] : outputs of vx
         self.__out = { }
 
+        # vertices without inputs/outputs
+        self.__sources = set()
+        self.__sinks = set()
+
+        # (vx0, vx1) : edges
+        self.__edge_set = set()
+
         # graph map properties
         self.__properties = HGraphProps(self)
 
+        # edges cache
+        self.__cache = { }
+
         '''
         # hovering support
         self.on_hover = None
@@ -1033,6 +1217,11 @@ class HGraph:
         if self.__ginit:
             self.__ginit(self)
 
+    def _clear_cache(self):
+        """Private method. Clears the cached edges. Called by the :func:`modifies_graph` decorator, and when neighbours are reordered."""
+        self.__cache.clear()
+        self.__version = self.__version + 1
+
     def __gen_vx_id(self):
         """Private method. Generates a unique integer ID for a new vertex in the graph."""
 
@@ -1040,6 +1229,40 @@ class HGraph:
         self.__vx_counter = self.__vx_counter + 1
         return _id
 
+    def __new_vx(self, ivx):
+        """Private method. Registers a vertex just added to the graph-tool graph as `ivx`, and returns its vertex ID."""
+        vx = self.__gen_vx_id()
+
+        self.__ivx[vx] = ivx
+        self.__vx[ivx] = vx
+
+        self.__sources.add(vx)
+        self.__sinks.add(vx)
+
+        if self.__vinit:
+            self.__vinit(self, vx)
+
+        return vx
+
+    def __new_edge(self, s, t):
+        """Private method. Bookkeeping of an edge (`s`, `t`) just added to the graph-tool graph."""
+        if t not in self.__in:
+            self.__in[t] = [s]
+        else:
+            self.__in[t].append(s)
+
+        if s not in self.__out:
+            self.__out[s] = [t]
+        else:
+            self.__out[s].append(t)
+
+        self.__edge_set.add((s, t))
+        self.__sources.discard(t)
+        self.__sinks.discard(s)
+
+        if self.__einit:
+            self.__einit(self, (s, t))
+
     def __to_ivs(self, vs):
         """Private method which maps persistent vertex IDs to graph-tool vertex IDs (ivx). """
         ret = {}
@@ -1063,38 +1286,34 @@ class HGraph:
         if order is None and anchor is not None:
             raise RuntimeError("anchor specified without specifying order!")
 
-        if (order is not None) and (len(order) > 0):
-            if type(order) == int:
-                order = [order]
+        if isinstance(order, int):
+            order = [order]
 
-            if not set(order).issubset(set(nb)):
+        if (order is not None) and (len(order) > 0):
+            _order = set(order)
+            if not _order.issubset(nb):
                 raise RuntimeError("specified order %s is not a subset of neighbours of vertex %d: %s!" % (order, vx, nb))
 
-            # remove elements from list
-            for x in order:
-                nb.remove(x)
+            # remove elements from list (single pass)
+            rest = [ x for x in nb if x not in _order ]
 
             if anchor is None:
-                if after:
-                    nb.extend(order)
-                else:
-                    nb = order + nb
-            elif type(anchor) == int:
+                pos = len(rest) if after else 0
+            elif isinstance(anchor, int):
                 try:
-                   pos = nb.index(anchor)
+                   pos = rest.index(anchor)
                 except ValueError:
                     raise RuntimeError("anchor '%d' not found!" % anchor)
 
                 if after:
-                    nb = nb[0:pos+1] + order + nb[pos+1:]
-                else:
-                    nb = nb[0:pos] + order + nb[pos:]
+                    pos = pos + 1
             else:
                 raise RuntimeError("invalid anchor '%s': must be an int!" % anchor)
 
-            if _in:
-                self.__in[vx] = nb
-            else:
-                self.__out[vx] = nb
+            # update in place: nb is the neighbour list stored in __in/__out
+            nb[:] = rest[0:pos] + list(order) + rest[pos:]
+
+            # cached data may depend on the order of neighbours
+            self._clear_cache()
 
         return nb
@@ -1,5 +1,40 @@
 import copy
 
+# values of these types are shared rather than copied
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes)
+
+class _Unclonable(Exception):
+    pass
+
+def _clone(x, seen):
+    # fast deep copy of plain containers of scalars
+    t = type(x)
+    if t in _IMMUTABLE:
+        return x
+    if id(x) in seen:
+        # shared or recursive container: requires deepcopy's memo
+        raise _Unclonable()
+    seen.add(id(x))
+    if t is dict:
+        return { k: _clone(v, seen) for (k, v) in x.items() }
+    if t is list:
+        return [ _clone(v, seen) for v in x ]
+    if t is tuple:
+        return tuple(_clone(v, seen) for v in x)
+    if t is set:
+        return { _clone(v, seen) for v in x }
+    raise _Unclonable()
+
+def _copy_props(props):
+    try:
+        return _clone(props, set())
+    except _Unclonable:
+        return copy.deepcopy(props)
+
+def _is_vx(key):
+    # bool is a subclass of int, but True/False are never vertex ids
+    return isinstance(key, int) and not isinstance(key, bool)
+
 class HGraphProps(dict):
     def __init__(self, g):
         self.g = g
@@ -8,58 +43,91 @@ class HGraphProps(dict):
         super().__init__()
 
     def copy_prop_elem(self, new_g, new_elem, elem):
-        if type(elem) == int:
+        if _is_vx(elem):
             self.g.check_vx(elem, verify=True)
             new_g.check_vx(new_elem, verify=True)
-            # we only copy if it exists
-            if elem in self.vx:
-                new_g.pmap[new_elem] = copy.deepcopy(self.vx[elem])
-        elif type(elem) == tuple and len(elem) == 2:
+            # we only copy if it exists and is not empty
+            props = self.vx.get(elem, None)
+            if props:
+                new_g.pmap[new_elem] = _copy_props(props)
+        elif isinstance(elem, tuple) and len(elem) == 2:
             self.g.check_edge(elem, verify=True)
             new_g.check_edge(new_elem, verify=True)
-            if elem in self.eg:
-                new_g.pmap[new_elem] = copy.deepcopy(self.eg[elem])
+            props = self.eg.get(elem, None)
+            if props:
+                new_g.pmap[new_elem] = _copy_props(props)
         else:
-            raise RuntimeError("invalid element '%s' specified!" % str(key))
+            raise RuntimeError("invalid element '%s' specified!" % str(elem))
 
 
+    def copy_props(self, new_g, vx_map, edges):
+        # bulk version of copy_prop_elem: vertices (vx_map keys) and edges are known to
+        # exist in this graph, and their mapped counterparts in new_g. Empty property
+        # maps are skipped: they are generated on demand when accessed
+        new_props = new_g.pmap
+        src_vx = self.vx
+        src_eg = self.eg
+        for (vx, new_vx) in vx_map.items():
+            props = src_vx.get(vx, None)
+            if props:
+                new_props.vx[new_vx] = _copy_props(props)
+        for e in edges:
+            props = src_eg.get(e, None)
+            if props:
+                new_props.eg[(vx_map[e[0]], vx_map[e[1]])] = _copy_props(props)
+
     def rm_elem(self, elem):
-        if type(elem) == int:
+        if _is_vx(elem):
             if elem in self.vx:
                del self.vx[elem]
-        elif type(elem) == tuple and len(elem) == 2:
+        elif isinstance(elem, tuple) and len(elem) == 2:
             if elem in self.eg:
                del self.eg[elem]
         else:
-            raise RuntimeError("invalid element '%s' specified!" % str(key))
+            raise RuntimeError("invalid element '%s' specified!" % str(elem))
+
+    def rm_elems(self, vs, edges):
+        # bulk version of rm_elem: vertices `vs` and edges `edges` are removed
+        for vx in vs:
+            self.vx.pop(vx, None)
+        for e in edges:
+            self.eg.pop(e, None)
+
+    def _get_vx_unchecked(self, vx):
+        # same as self[vx] without validation: assumes vertex vx exists (internal callers)
+        # dynamic generation of property map (single lookup when it exists)
+        props = self.vx.get(vx, None)
+        if props is None:
+            props = self.vx[vx] = { }
+        return props
+
+    def _get_eg_unchecked(self, edge):
+        # same as self[edge] without validation: assumes edge exists (internal callers)
+        props = self.eg.get(edge, None)
+        if props is None:
+            props = self.eg[edge] = { }
+        return props
 
     def __getitem__(self, key):
-        if type(key) == int:
+        if _is_vx(key):
             # vertex
             self.g.check_vx(key, verify=True)
+            return self._get_vx_unchecked(key)
 
-            # dynamic generation of property map
-            if key not in self.vx:
-                self.vx[key] = { }
-            return self.vx[key]
-
-        if type(key) == tuple and len(key) == 2:
+        if isinstance(key, tuple) and len(key) == 2:
             self.g.check_edge(key, verify=True)
-            if key not in self.eg:
-                self.eg[key] = {}
-
-            return self.eg[key]
+            return self._get_eg_unchecked(key)
 
         return super().__getitem__(key)
 
     def __setitem__(self, key, value):
-        if type(key) == int:
+        if _is_vx(key):
             # vertex
             if type(value) != dict:
                raise RuntimeError("property map value must be 'dict' type!")
 
             self.vx[key] = value
-        elif type(key) == tuple and len(key) == 2:
+        elif isinstance(key, tuple) and len(key) == 2:
             # vertex
             if type(value) != dict:
                raise RuntimeError("property map value must be 'dict' type!")
@@ -1,3 +1,4 @@
+import functools
 from lark import Lark
 from heterograph.query.transformer import QueryTransformer
 
@@ -37,7 +38,16 @@ graph           : "(" graph ("|" graph)* ")" -> group_graph
 %import common.WS
 %ignore WS
 """
-from lark import Lark
+
+@functools.cache
+def _query_parser():
+    # LALR tables are built once per process (cache=True also persists them on disk)
+    return Lark(query_grammar, start='graph', parser='lalr', cache=True)
+
+@functools.cache
+def _query_transformer():
+    # stateless: shared by all QueryAQL instances
+    return QueryTransformer()
 
 class QueryAQL:
     """
@@ -107,10 +117,9 @@ class QueryAQL:
         """
         Initializes with the specified grammar and transformer.
         """
-        global query_grammar
-        self.grammar = Lark(query_grammar, start='graph', parser='lalr')
+        self.grammar = _query_parser()
         """the grammar used to parse the queries."""
 
-        self.transformer = QueryTransformer()
+        self.transformer = _query_transformer()
         """(QueryTransformer): the transformer used to transform the parsed queries."""
 
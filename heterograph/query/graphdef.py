@@ -31,8 +31,10 @@ class QueryGraphDef:
 
     @staticmethod
     def args_label(args):
-        sep = ", " if len(args[0]) != 0 and len(args[1]) != 0 else ""
-        return "(%s%s%s)" % (str(args[0])[1:-1], sep, str(args[1])[1:-1])
+        pos = ", ".join([ repr(x) for x in args[0] ])
+        kw = ", ".join([ "%r: %r" % (k, v) for (k, v) in args[1].items() ])
+        sep = ", " if pos and kw else ""
+        return "(%s%s%s)" % (pos, sep, kw)
 
     def build(self, qgraph, vx_args=None, eg_args=None):
         """
@@ -107,57 +109,57 @@ class QueryGraphDef:
         if eg_args is None:
             eg_args = eg_args_default
 
-        ids = qgraph.pmap['ids']
+        # 2-tuple: vertex (<vertex-id>, v-args)
+        # 3-tuple: edge (<vertex-id-src>, <vertex-id-target>, e-args)
         for s in self.steps:
-            # 2-tuple: vertex (<vertex-id>, v-args)
-            # 3-tuple: edge (e-args, <vertex-id-src>, <vertex-id-target>)
-            if type(s) == tuple:
-                len_s = len(s)
-                if len_s == 2:
-                    # vertex
-
-                    # only add if vertex does not exist
-                    vertex_id = s[0]
-                    if vertex_id not in ids:
-                       v = qgraph.add_vx(1)
-                       ids[vertex_id] = v
-                       qgraph.pmap[v]['id'] = vertex_id
-                       qgraph.pmap[v]['args'] = ""
-                    else:
-                        v = ids[vertex_id]
-
-                    vargs = s[1]
-                    if vargs is not None:
-                        if qgraph.pmap[v]['args'] == "":
-                            vx_args(qgraph, v, *vargs[0], **vargs[1])
-                            qgraph.pmap[v]['args'] = QueryGraphDef.args_label(vargs)
-                        else:
-                            raise RuntimeError("arguments for vertex [%s] have already been supplied!" % vertex_id)
+            if not (isinstance(s, tuple) and len(s) in (2, 3)):
+                raise RuntimeError("invalid step: %s" % (s,))
+
+        pmap = qgraph.pmap
+        ids = pmap['ids']
+
+        # vertices: only add if vertex does not exist (single allocation)
+        new_ids = list(dict.fromkeys(s[0] for s in self.steps if len(s) == 2 and s[0] not in ids))
+        if new_ids:
+            vs = qgraph.add_vx(len(new_ids))
+            if not isinstance(vs, list):
+                vs = [vs]
+            for (vertex_id, v) in zip(new_ids, vs):
+                ids[vertex_id] = v
+                props = pmap._get_vx_unchecked(v)
+                props['id'] = vertex_id
+                props['args'] = ""
+
+        # arguments are supplied in step order
+        for s in self.steps:
+            if len(s) == 2:
+                (vertex_id, vargs) = s
+                v = ids[vertex_id]
+                if vargs is not None:
+                    if pmap._get_vx_unchecked(v)['args'] == "":
+                        vx_args(qgraph, v, *vargs[0], **vargs[1])
+                        # vx_args may have replaced the property map
+                        pmap._get_vx_unchecked(v)['args'] = QueryGraphDef.args_label(vargs)
                     else:
-                        vx_args(qgraph, v) # default
-                    continue
-                elif len_s == 3:
-                    vertex_id_s = s[0]
-                    vertex_id_t = s[1]
-                    eargs = s[2]
-                    edge = (ids[vertex_id_s], ids[vertex_id_t])
-
-                    # only add if edge does not exist
-                    if not qgraph.check_edge(edge):
-                        qgraph.add_edge(ids[vertex_id_s], ids[vertex_id_t])[0]
-                        qgraph.pmap[edge]['args'] = ""
-
-                    if eargs is not None:
-                        if qgraph.pmap[edge]['args'] == "":
-                            eg_args(qgraph, edge, *eargs[0], **eargs[1])
-                            qgraph.pmap[edge]['args'] = QueryGraphDef.args_label(eargs)
-                        else:
-                            raise RuntimeError("arguments for edge (%s, %s) have already been supplied!" % (vertex_id_s, vertex_id_t))
+                        raise RuntimeError("arguments for vertex [%s] have already been supplied!" % vertex_id)
+                else:
+                    vx_args(qgraph, v) # default
+            else:
+                (vertex_id_s, vertex_id_t, eargs) = s
+                edge = (ids[vertex_id_s], ids[vertex_id_t])
+
+                # only add if edge does not exist
+                if not qgraph.check_edge(edge):
+                    qgraph.add_edge(edge[0], edge[1])
+                    pmap._get_eg_unchecked(edge)['args'] = ""
+
+                if eargs is not None:
+                    if pmap._get_eg_unchecked(edge)['args'] == "":
+                        eg_args(qgraph, edge, *eargs[0], **eargs[1])
+                        pmap._get_eg_unchecked(edge)['args'] = QueryGraphDef.args_label(eargs)
                     else:
-                        eg_args(qgraph, edge) # default
-
-
-                    continue
-            raise RuntimeError("invalid step: %s" % s)
+                        raise RuntimeError("arguments for edge (%s, %s) have already been supplied!" % (vertex_id_s, vertex_id_t))
+                else:
+                    eg_args(qgraph, edge) # default
 
         return qgraph
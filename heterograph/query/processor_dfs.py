@@ -1,7 +1,7 @@
 from typing import ChainMap
-import itertools
+import math
 from heterograph.query.qgraph import QGraph
-from heterograph.algorithm.dfs import dfs_traversal, get_paths
+from heterograph.algorithm.dfs import get_paths
 
 
 class QueryProcessorDFS:
@@ -31,66 +31,140 @@ class QueryProcessorDFS:
         return check_min and check_max
 
     @staticmethod
-    def __find_match(g, qgraph, chain, qchain, path_check, root_depth, vx_depths, fd, gd):
+    def __depth_range(root_depth, depth_constr):
         """
-        Finds matches in the graph for the given query graph.
+        Converts depth constraints relative to a root into an absolute range of vertex depths.
+
+        Args:
+            root_depth (int): The depth of the root vertex.
+            depth_constr (tuple or None): A tuple containing the minimum and maximum depth constraints, or None if unrestricted.
+
+        Returns:
+            tuple: The minimum and maximum vertex depths, where unrestricted bounds are infinite.
+        """
+        (dmin, dmax) = (None, None) if depth_constr is None else depth_constr
+
+        return (-math.inf if dmin is None else root_depth + dmin,
+                math.inf if dmax is None else root_depth + dmax)
+
+    @staticmethod
+    def __find_match(g, qgraph, chain, qchain, path_check, vx_depths, out_vs, fd, gd, tree, memo):
+        """
+        Finds matches in the graph for the given query graph. Results are memoized in `memo`; see `__iter_match` for the arguments.
+
+        Returns:
+            list: A list of matches found in the graph, where each match is a tuple of vertices ordered from the last query vertex of the path to the first.
+        """
+        # the same subproblem is reached from every ancestor matching the previous
+        # query vertex: solve it once
+        key = (chain, qchain, gd)
+        matches = memo.get(key, None)
+        if matches is None:
+            matches = memo[key] = list(QueryProcessorDFS.__iter_match(g=g,
+                                                                      qgraph=qgraph,
+                                                                      chain=chain,
+                                                                      qchain=qchain,
+                                                                      path_check=path_check,
+                                                                      vx_depths=vx_depths,
+                                                                      out_vs=out_vs,
+                                                                      fd=fd,
+                                                                      gd=gd,
+                                                                      tree=tree,
+                                                                      memo=memo))
+        return matches
+
+    @staticmethod
+    def __iter_match(g, qgraph, chain, qchain, path_check, vx_depths, out_vs, fd, gd, tree, memo):
+        """
+        Generates matches in the graph for the given query graph.
 
         Args:
             g (HGraph): The graph to be searched.
             qgraph (QGraph): The query graph.
             chain (tuple): A tuple representing the current chain in the graph.
-            qchain (tuple): A tuple representing the current chain in the query graph.
+            qchain (tuple): A tuple representing the current chain in the query graph, where the query path is a tuple.
             path_check (function): A function to check the path validity.
-            root_depth (int): The depth of the root vertex.
-            fd (optional, can be an integer or a tuple of two integers): This parameter specifies the distance between the root and the first node of the match. If not provided, the distance is unrestricted.
-            gd (optional, can be an integer or a tuple of two integers): This parameter specifies the distance between the root and any node of the match. If not provided, the distance is unrestricted.
+            vx_depths (dict): The depth of each vertex.
+            out_vs (dict): The out-neighbours of each vertex (as returned by `out_vx`).
+            fd (tuple): The range of depths allowed for the first node of the match (see `__depth_range`).
+            gd (tuple): The range of depths allowed for any node of the match (see `__depth_range`).
+            tree (bool): Whether the vertices reachable from the root form a tree, so that depths increase away from the root.
+            memo (dict): Results of previously solved (chain, qchain, gd) subproblems, shared across a single run.
 
 
-        Returns:
-            list: A list of matches found in the graph.
+        Yields:
+            tuple: A match found in the graph, as a tuple of vertices ordered from the last query vertex of the path to the first.
         """
-        def post(g, vx, synth):
-            nonlocal qgraph, prefix_vx, prefix_qvx, qvx, rest_path
+        (prefix_qvx, path) = qchain
 
-            synth = list(itertools.chain(*synth))
+        if len(path) == 0:
+            return
 
-            vx_depth = vx_depths[vx]
+        qvx = path[0]
+        rest_path = path[1:]
+        (fd_min, fd_max) = fd
+        (gd_min, gd_max) = gd
+        (prefix_vx, root_vx) = chain
 
+        # first pass (iterative post-order DFS from root_vx): the matches rooted at
+        # each vertex, and whether any vertex reachable from it has matches (live).
+        # On trees, descendants of a vertex at depth gd_max are deeper than gd and are
+        # pruned; on DAGs, depths are not monotone and every vertex is visited
+        own = { }
+        live = { }
+        stack = [(root_vx, None)]
+        while stack:
+            (vx, child_vs) = stack.pop()
+            if child_vs is None:
+                if vx in live:
+                    continue
+                if vx in own:
+                    raise RuntimeError("[x] This algorithm can only be used with acyclic graphs!")
+                own[vx] = None
+                child_vs = out_vs[vx]
+                stack.append((vx, child_vs))
+                if not tree or vx_depths[vx] < gd_max:
+                    stack.extend((c_vx, None) for c_vx in reversed(child_vs))
+                continue
+
+            vx_matches = own[vx] = [ ]
+            vx_depth = vx_depths[vx]
             # fd
-            if (fd is None) or (prefix_vx is not None) or QueryProcessorDFS.check_depth(root_depth, vx_depth, fd):
+            if (prefix_vx is not None) or (fd_min <= vx_depth <= fd_max):
                 # gd
-                if (gd is None) or  QueryProcessorDFS.check_depth(root_depth, vx_depth, gd):
+                if gd_min <= vx_depth <= gd_max:
                     if path_check(g, qgraph, (prefix_vx, vx), (prefix_qvx, qvx)):
                         if len(rest_path) != 0:
-                            child_vs = g.out_vx(vx)
                             for c_vx in child_vs:
                                 partial_match = QueryProcessorDFS.__find_match(g=g,
                                                                                qgraph=qgraph,
                                                                                chain=(vx, c_vx),
                                                                                qchain=(qvx, rest_path),
                                                                                path_check=path_check,
-                                                                               root_depth=root_depth,
                                                                                vx_depths=vx_depths,
+                                                                               out_vs=out_vs,
                                                                                fd=fd,
-                                                                               gd=gd)
+                                                                               gd=gd,
+                                                                               tree=tree,
+                                                                               memo=memo)
 
-                                for pm in partial_match:
-                                    pmatch={**pm}
-                                    pmatch[qgraph.pmap[qvx]['id']]=vx
-                                    synth.append(pmatch)
+                                vx_matches.extend(pm + (vx,) for pm in partial_match)
                         else:
-                            synth.append({qgraph.pmap[qvx]['id']:vx})
-            return synth
-
-        (prefix_qvx, path) = qchain
-
-        if len(path) == 0:
-            return []
-
-        qvx,*rest_path = path
-        (prefix_vx, root_vx) = chain
-
-        return dfs_traversal(g=g, vx=root_vx, post=post)
+                            vx_matches.append((vx,))
+            live[vx] = len(vx_matches) != 0 or any(live.get(c_vx, False) for c_vx in child_vs)
+
+        # second pass: matches of a vertex are those of each child (as in out_vx),
+        # followed by its own. A vertex shared by several parents is expanded once per
+        # parent, so its matches are repeated, as with a DFS traversal synthesising
+        # from its children; only live vertices are expanded
+        stack = [(root_vx, False)]
+        while stack:
+            (vx, expanded) = stack.pop()
+            if expanded:
+                yield from own[vx]
+            else:
+                stack.append((vx, True))
+                stack.extend((c_vx, False) for c_vx in reversed(out_vs[vx]) if live.get(c_vx, False))
 
     def run(self, g, qgraph, *, vs=None, path_check=None, match_filter=None, fd=None, gd=None):
         """
@@ -116,47 +190,75 @@ class QueryProcessorDFS:
             match_filter = lambda g, qgraph, match: True
 
         if fd is not None:
-            if type(fd) == int:
+            if isinstance(fd, int):
                 fd=(fd, fd)
-            elif type(fd) != tuple or len(fd) != 2:
+            elif not isinstance(fd, tuple) or len(fd) != 2:
                 raise RuntimeError("invalid fd: expecting an int or an (int, int)!")
 
         if gd is not None:
-            if type(gd) == int:
+            if isinstance(gd, int):
                 gd=(gd, gd)
-            elif type(gd) != tuple or len(gd) != 2:
+            elif not isinstance(gd, tuple) or len(gd) != 2:
                 raise RuntimeError("invalid gd: expecting an int or an (int, int)!")
 
          # create paths from qgraph
-        paths = get_paths(g=qgraph)
+        if isinstance(qgraph, QGraph):
+            paths = qgraph.paths # cached
+        else:
+            paths = [tuple(path) for path in get_paths(g=qgraph)]
+
+        # matches are built as vertex tuples (last query vertex of the path first),
+        # and only converted to {id: vx} dictionaries once complete
+        path_ids = [ [ qgraph.pmap._get_vx_unchecked(qvx)['id'] for qvx in reversed(path) ] for path in paths ]
 
         if vs is None:
             vs = g.source
 
         matches=[]
 
+        # depth of each vertex relative to its root (iterative DFS); as with a DFS
+        # traversal, each vertex is visited once per root. The out-neighbours of each
+        # vertex are kept for matching, which visits every vertex many times
         vx_depths = { }
-        def pre_depth(g, vx, inh):
-            if vx in vx_depths:
-                raise RuntimeError("[x] This algorithm can only be used with tree graphs!")
-            vx_depths[vx] = inh
-            return inh + 1
-
+        out_vs = { }
+        trees = { }
         for vx in vs:
-            dfs_traversal(g=g, vx=vx, pre=pre_depth, inh=0)
-
+            depths = { }
+            trees[vx] = True
+            stack = [(vx, 0)]
+            while stack:
+                (v, depth) = stack.pop()
+                if v in depths:
+                    # reached twice from this root: not a tree
+                    trees[vx] = False
+                    continue
+                if v in vx_depths:
+                    raise RuntimeError("[x] This algorithm can only be used with tree graphs!")
+                depths[v] = depth
+                child_vs = out_vs[v] = g.out_vx(v)
+                stack.extend((c_vx, depth + 1) for c_vx in reversed(child_vs))
+            vx_depths.update(depths)
+
+        memo = { }
         for vx in vs:
-            for path in paths:
-                match=[ m for m in QueryProcessorDFS.__find_match(g=g,
-                                                                  qgraph=qgraph,
-                                                                  chain=(None, vx),
-                                                                  qchain=(None, path),
-                                                                  path_check=path_check,
-                                                                  root_depth=vx_depths[vx],
-                                                                  vx_depths=vx_depths,
-                                                                  fd=fd,
-                                                                  gd=gd)
-                        if match_filter(g, qgraph, m)
-                      ]
-                matches.extend(match)
-        return matches
\ No newline at end of file
+            # fd and gd as absolute depth ranges for this root
+            vx_fd = QueryProcessorDFS.__depth_range(vx_depths[vx], fd)
+            vx_gd = QueryProcessorDFS.__depth_range(vx_depths[vx], gd)
+            for (path, ids) in zip(paths, path_ids):
+                # matches from a root are never shared: stream them through match_filter
+                pmatches = QueryProcessorDFS.__iter_match(g=g,
+                                                          qgraph=qgraph,
+                                                          chain=(None, vx),
+                                                          qchain=(None, path),
+                                                          path_check=path_check,
+                                                          vx_depths=vx_depths,
+                                                          out_vs=out_vs,
+                                                          fd=vx_fd,
+                                                          gd=vx_gd,
+                                                          tree=trees[vx],
+                                                          memo=memo)
+                for pm in pmatches:
+                    m = dict(zip(ids, pm))
+                    if match_filter(g, qgraph, m):
+                        matches.append(m)
+        return matches
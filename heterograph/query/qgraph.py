@@ -1,8 +1,23 @@
+import functools
 from heterograph.hgraph import HGraph
+from heterograph.algorithm.dfs import get_paths
 from heterograph.query.aql import QueryAQL
 from heterograph.query.transformer import QueryTransformer
 
 
+@functools.cache
+def _query_engine():
+    # the engine holds no per-query state: shared by all QGraph instances
+    return QueryAQL()
+
+@functools.lru_cache(maxsize=1024)
+def _query_graph_def(query):
+    # graph definition of a single AQL statement, shared between QGraphs with the
+    # same statement: it must not be modified (see QGraph._process)
+    engine = _query_engine()
+    return engine.transformer.transform(engine.grammar.parse(query))
+
+
 class QGraph(HGraph):
     """
     A class used to represent a query graph.
@@ -34,8 +49,8 @@ class QGraph(HGraph):
 
         def ginit(graph):
             graph.pmap['ids'] = { }
-            graph.vstyle['label'] = lambda g, vx: r'''<<TABLE CELLBORDER="0" CELLSPACING="0" border="0"><TR align="right"><TD><B>%s:</B>%d %s</TD></TR></TABLE>>''' % (g.pmap[vx]['id'], vx,  g.pmap[vx]['args'] )
-            graph.estyle['label'] = lambda g, eg: "%s" % (g.pmap[eg]['args'])
+            graph.vstyle['label'] = lambda g, vx: r'''<<TABLE CELLBORDER="0" CELLSPACING="0" border="0"><TR align="right"><TD><B>%s:</B>%d %s</TD></TR></TABLE>>''' % (g.pmap._get_vx_unchecked(vx)['id'], vx, g.pmap._get_vx_unchecked(vx)['args'])
+            graph.estyle['label'] = lambda g, eg: "%s" % (g.pmap._get_eg_unchecked(eg)['args'])
             graph.vstyle['shape'] = "component"
             graph.vstyle['fillcolor'] = "burlywood1"
 
@@ -46,17 +61,42 @@ class QGraph(HGraph):
         self.pattern = pattern
         """(str): pattern to be processed and translated to a graph."""
 
-        self.engine = QueryAQL()
-        """(QueryAQL): engine used to translate the pattern"""
+        self.engine = _query_engine()
+        """(QueryAQL): engine used to translate the pattern (shared by all instances)"""
 
         self.graph_def = None
         """ graph object resulting from processing the query."""
 
+        self.__paths = None
+
         try:
             self.graph_def = self._process(vx_args=vx_args, eg_args=eg_args)
         except Exception as e:
             raise SyntaxError(f"[x] error processing AQL pattern: '{self.pattern}'") from None
 
+    @property
+    def paths(self):
+        """
+        Returns all paths of the query graph, from its source vertices to its sink vertices.
+
+        The paths are computed on first access and cached until the query graph is modified.
+
+        Returns:
+            list of tuples: A list of paths, where each path is a tuple of vertices.
+
+        Example:
+            >>> qgraph = QGraph(pattern="A => B; A => C")
+            >>> qgraph.paths
+            [(0, 1), (0, 2)]
+        """
+        if self.__paths is None:
+            self.__paths = [ tuple(path) for path in get_paths(g=self) ]
+        return list(self.__paths)
+
+    def _clear_cache(self):
+        super()._clear_cache()
+        self.__paths = None
+
     def _process(self, vx_args, eg_args):
         """
         Processes the query and transforms it into a graph definition.
@@ -69,22 +109,12 @@ class QGraph(HGraph):
             QueryGraphDef: The graph definition resulting from processing the query.
         """
         query = self.pattern.replace('\n', '')
-        queries = []
-        for q in query.split(";"):
-            _q = q.strip()
-            if _q != '':
-                queries.append(_q)
-
-        graph_defs = []
-        for q in queries:
-           pre = self.engine.grammar.parse(q)
-           graph_def = self.engine.transformer.transform(pre)
-           graph_defs.append(graph_def)
-
-        if len(graph_defs) == 1:
-            graph_def = graph_defs[0]
-        else:
-            graph_def = QueryTransformer.merge_graphs(graph_defs)
+        queries = [ q for q in (q.strip() for q in query.split(";")) if q ]
+
+        # statements are parsed once per process; merging (even a single statement)
+        # creates a new graph definition that is owned by this QGraph
+        graph_defs = [ _query_graph_def(q) for q in queries ]
+        graph_def = QueryTransformer.merge_graphs(graph_defs)
 
         graph_def.build(self, vx_args, eg_args)
         return graph_def
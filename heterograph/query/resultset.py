@@ -32,24 +32,18 @@ class QueryResultSet:
         self.ids = list(qgraph.pmap['ids'].keys())
         """the list of IDs in the query graph."""
 
+        self._id_pos = { _id: pos for (pos, _id) in enumerate(self.ids) }
+        """maps each ID to its position in :attr:`ids` (and in each match)."""
+
         self.matches = None
         """the list of matches in the result set."""
 
-        if len(results) > 0 and type(results[0]) == dict:
-                # convert format 1 to format 2
-                self.matches = []
-                for  m in results:
-                    match = []
-                    for _id in self.ids:
-                        if _id not in m:
-                            #raise RuntimeError(f"cannot find id '{_id }' in result-set!")
-                            match.append(None)
-                        # we store the result as 'vx' instead of cnode, since the
-                        # cnode could be removed, and we lose the ability to track
-                        # it
-                        else:
-                            match.append(m[_id])
-                    self.matches.append(match)
+        if len(results) > 0 and isinstance(results[0], dict):
+                # convert format 1 to format 2: ids missing from a match are stored
+                # as None. We store the result as 'vx' instead of cnode, since the
+                # cnode could be removed, and we lose the ability to track it
+                ids = self.ids
+                self.matches = [ [ m.get(_id) for _id in ids ] for m in results ]
         else:
             self.matches = copy.copy(results)
 
@@ -62,9 +56,25 @@ class QueryResultSet:
         self.vs = set(g.vertices)
         """set of vertices in the graph."""
 
+        self.__current_vs = (g.version, self.vs)
+        """(graph version, set of vertices) of the graph at that version."""
+
         self.__iter = None
         """iterator object for the result set."""
 
+    def _current_vs(self):
+        """
+        Returns the set of vertices currently in the graph, which is only rebuilt if the graph has been modified.
+
+        Returns:
+            set: The set of vertices in the graph. It must not be modified.
+        """
+        (version, vs) = self.__current_vs
+        if version != self.g.version:
+            vs = set(self.g.vertices)
+            self.__current_vs = (self.g.version, vs)
+        return vs
+
     def apply(self, action, **kwargs):
         """
         Applies the given action to the result set.
@@ -93,38 +103,11 @@ class QueryResultSet:
             RuntimeError: If a vertex in the query result has been removed.
 
         """
-        class Result:
-            def __init__(self, qrs:QueryResultSet, ids, match):
-
-                for _id in match:
-                    if _id is not None:
-                        if not qrs.g.check_vx(_id):
-                            raise RuntimeError("Query result corruption: vertex [%d] has been removed!" % _id)
-
-                self.result = dict(zip(ids, match))
-
-                for r in self.result:
-                    vx = self.result[r]
-                    if vx is None:
-                        self.__setattr__(r, None)
-                    else:
-                        self.__setattr__(r, qrs.g[self.result[r]])
-
-            @property
-            def match(self):
-                return self.result
-
-            def __getitem__(self, item):
-                return getattr(self, item)
-
-            def __repr__(self):
-                return str(self.result)
-
         return Result(self, ids, match)
 
     def __repr__(self):
 
-        g_vs = set(self.g.vertices)
+        g_vs = self._current_vs()
 
         def fmt(match):
             fmatch = []
@@ -149,8 +132,7 @@ class QueryResultSet:
             Returns:
                 set: The set of vertices that have been removed.
             """
-            current_vs = set(self.g.vertices)
-            return self.vs - current_vs
+            return self.vs - self._current_vs()
 
 
     @property
@@ -161,8 +143,7 @@ class QueryResultSet:
         Returns:
             set: The set of inserted vertices.
         """
-        current_vs = set(self.g.vertices)
-        return current_vs - self.vs
+        return self._current_vs() - self.vs
 
     def __iter__(self):
         """Returns an iterator object for the result set."""
@@ -205,16 +186,37 @@ class QueryResultSet:
         return self._create_match_obj(self.ids, self.matches[item])
 
 
+class Result:
+    """
+    Represents a single match of a query result set. Each identifier of the query graph is available as an attribute.
 
+    Args:
+        qrs (QueryResultSet): The result set the match belongs to.
+        ids (list): A list of IDs corresponding to the query result.
+        match (list): A list of vertices for the query result.
+    """
+    def __init__(self, qrs:QueryResultSet, ids, match):
 
+        for _id in match:
+            if _id is not None:
+                if not qrs.g.check_vx(_id):
+                    raise RuntimeError("Query result corruption: vertex [%d] has been removed!" % _id)
 
+        self.result = dict(zip(ids, match))
 
+        for r in self.result:
+            vx = self.result[r]
+            if vx is None:
+                self.__setattr__(r, None)
+            else:
+                self.__setattr__(r, qrs.g[self.result[r]])
 
+    @property
+    def match(self):
+        return self.result
 
+    def __getitem__(self, item):
+        return getattr(self, item)
 
-
-
-
-
-
-
+    def __repr__(self):
+        return str(self.result)
@@ -1,3 +1,5 @@
+from operator import itemgetter
+
 class RSet:
     """
     Represents a set of query results.
@@ -27,17 +29,16 @@ class RSet:
         pos = []
         for i in target:
             try:
-                pos.append(rs.ids.index(i))
-            except ValueError:
+                pos.append(rs._id_pos[i])
+            except KeyError:
                 raise ValueError(f"Identifier '{i}' does not exist in query results!") from None
 
-        fmatches = []
-        stored_matches = set() # keep all vx from column idt
+        # first match for each combination of target vertices (in match order)
+        key = itemgetter(*pos) if len(pos) > 0 else (lambda match: ())
+        stored_matches = { }
         for match in rs.matches:
-            vx_match = tuple([match[p] for p in pos])
-            if vx_match not in stored_matches:
-                fmatches.append(match)
-                stored_matches.add(vx_match)
+            stored_matches.setdefault(key(match), match)
+        fmatches = list(stored_matches.values())
 
         qrs = rs.__class__(g=rs.g, qgraph=rs.qgraph, results=fmatches)
 
@@ -62,8 +63,8 @@ class RSet:
         fmatches = []
 
         try:
-            pos = rs.ids.index(target)
-        except ValueError:
+            pos = rs._id_pos[target]
+        except KeyError:
             raise ValueError(f"Identifier '{target}' does not exist in query results!") from None
 
         for match in rs.matches:
@@ -123,12 +123,12 @@ class QueryTransformer(Transformer):
         Returns:
             tuple: A tuple containing two elements - a list of positional arguments and a dictionary of keyword arguments.
         """
-        if type(items) != list:
+        if not isinstance(items, list):
             items = [items]
         args = []
         kwargs = {}
         for arg in items:
-            if type(arg) == dict:
+            if isinstance(arg, dict):
                 kwargs.update(arg)
             else:
                 args.append(arg)
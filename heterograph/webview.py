@@ -1,14 +1,62 @@
-from flask import Flask, render_template, request
+from flask import Flask, Response, abort, render_template, request
+from concurrent.futures import Future, ThreadPoolExecutor
+import functools
+import gzip
+import hashlib
+import json
 import threading
-import sys, os.path as osp
+import sys, os, os.path as osp
 import inspect
-from heterograph.hgraph import HGraph
+from heterograph.hgraph import HGraph, _pipe_batch
 from heterograph.utils.notebook import is_notebook
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import logging
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
 
+def _json_dumps(obj):
+    # JSON-encoded bytes: orjson is faster, when installed
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf8')
+
+@functools.cache
+def _render_pool():
+    # shared by all viewers: renders mostly wait on Graphviz processes
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='webview-render')
+
+@functools.lru_cache(maxsize=256)
+def _svg_digest(svg):
+    return hashlib.sha1(svg.encode('utf8')).hexdigest()
+
+@functools.lru_cache(maxsize=256)
+def _gzip_svg(svg):
+    # compressed once per drawing: Graphviz SVG is repetitive markup and compresses about tenfold
+    return gzip.compress(svg.encode('utf8'))
+
+def _json_response(pl):
+    # revisits of an unchanged payload are answered with 304 Not Modified
+    response = Response(_json_dumps(pl), content_type='application/json')
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def _parse_elem(elem):
+    # hovered element: vertex 'vx' or edge 'vx0,vx1' (optionally in parentheses)
+    if elem.isdecimal():
+        return int(elem)
+    return _parse_elems(elem)
+
+@functools.lru_cache(maxsize=1024)
+def _parse_elems(elem):
+    vs = tuple(int(vx) for vx in elem.strip().strip('()').split(','))
+    return vs[0] if len(vs) == 1 else vs
+
 class WebView:
     """
     A Flask-based web app that provides a graphical interface to visualize and interact with heterographs.
@@ -19,16 +67,6 @@ class WebView:
     graph.
     """
 
-    obj = None
-    """
-    Class-level variable that stores an instance of this WebView class. This is used to access its properties and methods from within static methods.
-
-    Type: WebView
-
-    Note:
-         The value of this attribute should be an instance of the WebView class. If it's not set or is not a WebView instance, accessing its properties or methods may result in errors.
-    """
-
     def __init__(self, root_path=None):
 
         """
@@ -36,7 +74,7 @@ class WebView:
 
         This method sets up a new WebView instance with Flask and adds URL rules for different routes such as index, first graph, next graph, previous graph, hovering over elements, and shutting down the server.
 
-        The class-level variable `obj` is set to this instance, which can be used to access its properties and methods from within static methods. It also initializes several lists for SVG representations of graphs, their titles, and associated hover functions.
+        The routes are bound to this instance. It also initializes several lists for SVG representations of graphs, their titles, and associated hover functions.
 
         Finally, if the application is not running in an IPython session (e.g., a Jupyter notebook), it will start the Flask web server on the specified host and port, or defaults to '0.0.0.0' and '8888' respectively. If it's running within an IPython session, it will display the SVG representations of all graphs without starting a server.
 
@@ -48,24 +86,26 @@ class WebView:
         if root_path is None:
            root_path = osp.join(osp.abspath(osp.dirname(__file__)), 'assets')
 
-        self.svg_graphs = []
+        self.svg_graphs = [] # None until a graph is first viewed
+        self._renders = [] # pending renders, see _svg()
+        self._prefetched = {} # index -> future of a render in progress (viewed or prefetched)
+        self._lock = threading.Lock() # guards the render bookkeeping and the active index
+        self._index_html = None # view page, rendered on first request
+        self._svg_index = {} # svg digest -> graph index, see req_svg()
         self.titles = []
         self.graphs = []
         self.on_hovers = [] # each graph has its hover
         self.hover_elem = None
         self.web_app = Flask('WebView', root_path=root_path)
-        self.web_app.add_url_rule('/', 'index', self.__class__.req_index)
-        self.web_app.add_url_rule('/first/', 'first', self.__class__.req_first)
-        self.web_app.add_url_rule('/first', 'first', self.__class__.req_first)
-        self.web_app.add_url_rule('/next/', 'next', self.__class__.req_next)
-        self.web_app.add_url_rule('/next', 'next', self.__class__.req_next)
-        self.web_app.add_url_rule('/prev', 'prev', self.__class__.req_prev)
-        self.web_app.add_url_rule('/prev/', 'prev', self.__class__.req_prev)
-        self.web_app.add_url_rule('/shutdown', 'shutdown', self.__class__.req_shutdown, methods=['POST'])
-        self.web_app.add_url_rule('/shutdown/', 'shutdown', self.__class__.req_shutdown, methods=['POST'])
-        self.web_app.add_url_rule('/hover/<elem>', 'hover', self.__class__.req_hover, methods=['GET'])
-
-        WebView.obj = self
+        # '/first' and '/first/' are served by the same rule (no redirect)
+        self.web_app.url_map.strict_slashes = False
+        self.web_app.add_url_rule('/', 'index', self.req_index)
+        self.web_app.add_url_rule('/first/', 'first', self.req_first)
+        self.web_app.add_url_rule('/next/', 'next', self.req_next)
+        self.web_app.add_url_rule('/prev/', 'prev', self.req_prev)
+        self.web_app.add_url_rule('/shutdown/', 'shutdown', self.req_shutdown, methods=['POST'])
+        self.web_app.add_url_rule('/hover/<elem>', 'hover', self.req_hover, methods=['GET'])
+        self.web_app.add_url_rule('/svg/<digest>.svg', 'svg', self.req_svg, methods=['GET'])
 
         self.index = -1
 
@@ -108,16 +148,109 @@ class WebView:
             If it is not, calling this method may raise errors because certain assumptions about the graph structure are made in the rendering process.
         """
 
-        #g=graph.copy()
-        self.graphs.append(graph)
-        self.titles.append(title)
-        if '!on_hover' in graph.style:
-            self.on_hovers.append(graph.style['!on_hover'])
-        else:
-            self.on_hovers.append(None)
+        self.add_graphs([graph], [title], **kwargs)
 
-        svg = graph.render(format="svg", pipe=True, **kwargs)
-        self.svg_graphs.append(svg.decode('utf8'))
+    def add_graphs(self, graphs, titles=None, **kwargs):
+        """
+        Adds multiple graphs to the WebView instance.
+
+        This function behaves like calling :meth:`add_graph` for each graph in turn. Each graph is captured as it is when added, but it is only rendered to SVG when it is first viewed; when all graphs are displayed at once (in a notebook), they are rendered concurrently.
+
+        Args:
+            graphs (list of hgraph): The graphs to be added to the WebView instance.
+            titles (list of str, optional): The title of each graph. If not provided, all titles default to an empty string.
+            **kwargs: Additional style information for the graphs, passed to the HGraph rendering method of every graph (see :meth:`add_graph`).
+
+        Returns:
+            None: This function does not return anything. It only modifies the WebView instance's state.
+
+        Raises:
+            RuntimeError: If the number of titles does not match the number of graphs.
+        """
+        graphs = list(graphs)
+        if titles is None:
+            titles = [''] * len(graphs)
+        elif len(titles) != len(graphs):
+            raise RuntimeError("expecting %d titles, got %d!" % (len(graphs), len(titles)))
+
+        renders = [ graph._render_deferred(format="svg", **kwargs) for graph in graphs ]
+
+        for (graph, title, render) in zip(graphs, titles, renders):
+            #g=graph.copy()
+            self.graphs.append(graph)
+            self.titles.append(title)
+            self.on_hovers.append(graph.style.get('!on_hover'))
+            self.svg_graphs.append(None)
+            self._renders.append(render)
+
+    def _svg(self, index):
+        """
+        Returns the SVG representation of a graph, rendering it on first access.
+
+        Args:
+            index (int): The index of the graph.
+
+        Returns:
+            str: The SVG representation of the graph.
+        """
+        svg = self.svg_graphs[index]
+        if svg is not None:
+            return svg
+
+        # a graph is rendered once: concurrent requests wait on the same render
+        with self._lock:
+            svg = self.svg_graphs[index]
+            if svg is not None:
+                return svg
+            future = self._prefetched.get(index, None)
+            owner = future is None
+            if owner:
+                future = self._prefetched[index] = Future()
+
+        if owner:
+            try:
+                future.set_result(self._renders[index]())
+            except BaseException as e:
+                future.set_exception(e)
+
+        try:
+            out = future.result()
+        finally:
+            with self._lock:
+                if self._prefetched.get(index, None) is future:
+                    del self._prefetched[index] # failed renders can be retried
+                    if future.exception() is None:
+                        self.svg_graphs[index] = out.decode('utf8')
+        return self.svg_graphs[index]
+
+    def _prefetch(self, index):
+        """
+        Starts rendering a graph in the background if it has not been rendered yet, so that it is ready when it is viewed.
+
+        Args:
+            index (int): The index of the graph.
+        """
+        with self._lock:
+            if self.svg_graphs[index] is None and index not in self._prefetched:
+                self._prefetched[index] = _render_pool().submit(self._renders[index])
+
+    def _render_all(self):
+        """
+        Renders all graphs that have not been viewed yet. Graphs are rendered in batches sharing a single Graphviz process; the remaining renders run concurrently, since each one spends most of its time waiting on a Graphviz process.
+        """
+        pending = [ i for (i, svg) in enumerate(self.svg_graphs) if svg is None ]
+        if len(pending) > 1:
+            outs = _pipe_batch([ self._renders[i].args for i in pending ])
+            for (i, out) in zip(pending, outs):
+                if out is not None:
+                    self.svg_graphs[i] = out.decode('utf8')
+            pending = [ i for i in pending if self.svg_graphs[i] is None ]
+
+        if len(pending) > 1:
+            list(_render_pool().map(self._svg, pending))
+        else:
+            for i in pending:
+                self._svg(i)
 
 
     def run(self, host='0.0.0.0', port='8888'):
@@ -142,6 +275,7 @@ class WebView:
             _in_ipython_session = False
         if _in_ipython_session:
             import IPython.display
+            self._render_all()
             for svg, title in zip(self.svg_graphs, self.titles):
                 if title != '':
                   IPython.display.display(IPython.display.HTML(f"<h3 style='color:orange;padding: 10px; border: 1px solid orange; border-radius: 5px; text-align: center;'>{title}</h3>"))
@@ -150,30 +284,34 @@ class WebView:
 
         host = '0.0.0.0' if host == None else host
         port = '8888' if port == None else port
-        self._next_graph()
+        # the first graphs are rendered in the background, while the browser connects
+        for index in range(min(len(self.svg_graphs), 3)):
+            self._prefetch(index)
         print(f"URL: =====[http://{host}:{port}]=====")
-        x = threading.Thread(target=self.web_app.run, kwargs=dict(host=host, port=port))
+        x = threading.Thread(target=self.web_app.run, kwargs=dict(host=host, port=port, threaded=True, use_reloader=False))
         x.start()
         x.join()
         #self.web_app.run(host=self.host, port=self.port, use_reloader=True)
 
-    @staticmethod
-    def req_index():
+    def req_index(self):
         """
         Renders and returns the HTML template for the view page.
 
         This function is used to render and return the HTML template that represents the view page.
         The view page usually provides a graphical interface for users to visualize and interact with heterographs.
 
+        The page does not depend on the request, so it is rendered on the first request (which provides the context for
+        its static URLs) and reused afterwards.
+
         Returns:
            str: A string representation of an HTML template which is rendered for the view page.
         """
+        if self._index_html is None:
+            self._index_html = render_template('view.html')
+        return self._index_html
 
-        return render_template('view.html')
 
-
-    @staticmethod
-    def req_hover(elem):
+    def req_hover(self, elem):
         """
         Handles user hover interaction with an element in the current graph.
 
@@ -194,70 +332,92 @@ class WebView:
 
         """
 
-        if ',' in elem:
-            elem = eval('(' + elem + ')')
-        else:
-            elem = int(elem)
-
-        g = WebView.obj.graphs[WebView.obj.index]
+        # prevent from invoking multiple times, if the item is the same
+        if elem == self.hover_elem:
+            return { }
 
-        on_hover = WebView.obj.on_hovers[WebView.obj.index]
+        index = self.index
+        on_hover = self.on_hovers[index]
 
-        # prevent from invoking multiple times, if the item is different
         if on_hover is not None:
-            if (WebView.obj.hover_elem is None) or (elem != WebView.obj.hover_elem):
-                if on_hover(g, elem):
-                    WebView.obj.hover_elem = elem
+            if on_hover(self.graphs[index], _parse_elem(elem)):
+                self.hover_elem = elem
 
         return { }
 
-    @staticmethod
-    def req_first():
+    def req_first(self):
         """
         Resets and returns the next graph payload.
 
-        This function resets the index of the active graph to -1, then calls `req_next()` to get the next graph's payload.
-        The result is a dictionary containing the SVG representation of the current graph, its title, total number of graphs in the viewer, and whether or not there is an hover function for the current graph.
+        This function resets the index of the active graph to -1 and moves to the next graph, as a single step, then returns its payload.
+        The result contains the URL of the SVG representation of the current graph, its title, total number of graphs in the viewer, and whether or not there is an hover function for the current graph.
 
         Returns:
-           dict: A dictionary containing the SVG representation of the current graph, its index, title, total number of graphs, and whether or not there is a hover function.
+           Response: A JSON response with the URL of the SVG representation of the current graph, its index, title, total number of graphs, and whether or not there is a hover function.
         """
-        WebView.obj._reset()
-        return WebView.obj.req_next()
+        (index, g) = self._goto(1, restart=True)
+        return _json_response(self.payload(g, index))
 
-    @staticmethod
-    def req_next():
+    def req_next(self):
         """
         Requests the next graph and returns its payload.
 
-        This function calls a private method `_next_graph()` to get the next graph in the viewer, then uses the `payload()`
-        static method to generate a dictionary containing information about that graph.
+        This function calls a private method `_goto()` to move to the next graph in the viewer, then uses the `payload()`
+        method to generate a dictionary containing information about that graph, which is returned as JSON.
 
         Returns:
-            dict: A dictionary containing the SVG representation of the current graph, its index, title, total number of graphs,
+            Response: A JSON response with the URL of the SVG representation of the current graph, its index, title, total number of graphs,
             and whether or not there is a hover function for the current graph.
         """
-        g = WebView.obj._next_graph()
-        return WebView.payload(g)
+        (index, g) = self._goto(1)
+        return _json_response(self.payload(g, index))
 
-    @staticmethod
-    def req_prev():
+    def req_prev(self):
         """
         Requests the previous graph and returns its payload.
 
-        This function calls a private method `_next_graph()` to get the previous graph in the viewer,
-        then uses the `payload()` static method to generate a dictionary containing information about that graph.
+        This function calls a private method `_goto()` to move to the previous graph in the viewer,
+        then uses the `payload()` method to generate a dictionary containing information about that graph,
+        which is returned as JSON.
 
         Returns:
-            dict: A dictionary containing the SVG representation of the current graph, its index, title, total number of graphs,
+            Response: A JSON response with the URL of the SVG representation of the current graph, its index, title, total number of graphs,
                 and whether or not there is a hover function for the current graph.
         """
 
-        g = WebView.obj._prev_graph()
-        return WebView.payload(g)
+        (index, g) = self._goto(-1)
+        return _json_response(self.payload(g, index))
 
-    @staticmethod
-    def req_shutdown():
+    def req_svg(self, digest):
+        """
+        Returns the SVG representation of a graph.
+
+        The SVG is addressed by a digest of its content (see `payload()`), so it never changes and the browser can
+        cache it indefinitely; revisiting a graph does not transfer it again.
+
+        Args:
+            digest (str): The digest of the SVG representation, as given by its URL in the payload.
+
+        Returns:
+            Response: The SVG image, or a 404 error if the digest is unknown.
+        """
+        index = self._svg_index.get(digest, None)
+        if index is None:
+            abort(404)
+
+        svg = self.svg_graphs[index]
+        if 'gzip' in request.accept_encodings:
+            response = Response(_gzip_svg(svg), mimetype='image/svg+xml')
+            response.content_encoding = 'gzip'
+        else:
+            response = Response(svg, mimetype='image/svg+xml')
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        return response
+
+    def req_shutdown(self):
         """
         Shuts down the server when user interaction is done.
 
@@ -277,41 +437,66 @@ class WebView:
         func()
         return "Server shutting down..."
 
-    @staticmethod
-    def payload(g):
+    def payload(self, g, index=None):
         """
-        Generates a dictionary containing the SVG representation of a graph, its index, title,
+        Generates a dictionary containing the URL of the SVG representation of a graph, its index, title,
         total number of graphs in the viewer, and whether or not there is an hover
         function for the current graph.
 
         Args:
-            g (hgraph): The graph to be included in the payload.
+            g (str): The SVG representation of the graph to be included in the payload.
+            index (int, optional): The index of the graph. Defaults to the index of the current graph.
 
         Returns:
             dict: A dictionary containing the following keys:
-                - 'svg': The SVG representation of the graph.
+                - 'svg_url': The URL of the SVG representation of the graph (see `req_svg()`).
                 - 'index': The index of the current graph.
                 - 'title': The title of the current graph.
                 - 'ngraphs': The total number of graphs in the viewer.
                 - 'hover': A boolean indicating whether or not there is an hover function for the current graph.
-
-        Note:
-            This method requires a WebView instance to be defined and its properties should be accessible.
-
         """
-        index = WebView.obj.index
-        pl = {'svg': g,
+        if index is None:
+            index = self.index
+        svg_url = None
+        if g is not None:
+            digest = _svg_digest(g)
+            self._svg_index[digest] = index
+            svg_url = f"/svg/{digest}.svg"
+        pl = {'svg_url': svg_url,
               'index': index,
-              'title': WebView.obj.titles[index],
-              'ngraphs': len(WebView.obj.svg_graphs),
-              'hover': WebView.obj.on_hovers[index] is not None
+              'title': self.titles[index],
+              'ngraphs': len(self.svg_graphs),
+              'hover': self.on_hovers[index] is not None
               }
         return pl
 
 
     def _reset(self):
         """Resets the active graph index back to -1."""
-        self.index = -1
+        with self._lock:
+            self.index = -1
+
+    def _goto(self, step, restart=False):
+        """
+        Moves the active graph index by `step` (with wrap-around), optionally starting over from -1, and returns the new
+        index together with the SVG representation of its graph. The graph following it in the same direction is then
+        rendered in the background, anticipating further navigation.
+
+        Returns:
+            tuple: The new index and the SVG representation of its graph, or (-1, None) if there are no graphs.
+        """
+        with self._lock:
+            ngraphs = len(self.svg_graphs)
+            if ngraphs == 0:
+                self.index = -1
+                return (-1, None)
+            if restart:
+                self.index = -1
+            index = self.index = (self.index + step) % ngraphs
+
+        svg = self._svg(index)
+        self._prefetch((index + step) % ngraphs)
+        return (index, svg)
 
 
     def _prev_graph(self):
@@ -320,17 +505,12 @@ class WebView:
 
         This method returns the SVG representation of the previous graph in the viewer. If there are no graphs, it sets index to -1 and returns None.
         Otherwise, it decrements the current index by 1 (with wrap-around if necessary), retrieves the new current graph from `self.svg_graphs` using the updated index, and returns it.
+        The graph before it is then rendered in the background, anticipating further navigation.
 
         Returns:
             The SVG representation of the previous graph in the viewer or None if there are no graphs.
         """
-        ngraphs = len(self.svg_graphs)
-        if ngraphs == 0:
-            self.index = -1
-            return None
-
-        self.index = (self.index - 1) % ngraphs
-        return self.svg_graphs[self.index]
+        return self._goto(-1)[1]
 
     def _next_graph(self):
         """
@@ -338,17 +518,12 @@ class WebView:
 
         This method returns the SVG representation of the next graph in the viewer. If there are no graphs, it sets index to -1 and returns None.
         Otherwise, it increments the current index by 1 (with wrap-around if necessary), retrieves the new current graph and returns it.
+        The graph after it is then rendered in the background, anticipating further navigation.
 
         Returns:
             The SVG representation of the next graph in the viewer or None if there are no graphs.
         """
-        ngraphs = len(self.svg_graphs)
-        if ngraphs == 0:
-            self.index = -1
-            return None
-
-        self.index = (self.index + 1) % ngraphs
-        return self.svg_graphs[self.index]
+        return self._goto(1)[1]
 
 
 
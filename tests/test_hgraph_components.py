@@ -0,0 +1,22 @@
+import pytest
+from heterograph.algorithm.components import connected_components
+from heterograph import *
+
+def test_connected_components():
+    g = HGraph()
+    g.add_vx(6)
+    g.add_edge(0, 1)
+    g.add_edge([2, 4], 3)
+    assert connected_components(g) == [[0, 1], [2, 3, 4], [5]]
+
+def test_connected_components_rm_vx():
+    g = HGraph()
+    g.add_vx(4)
+    g.add_edge(0, 1)
+    g.add_edge(1, [2, 3])
+    g.rm_vx(1)
+    assert connected_components(g) == [[0], [2], [3]]
+
+def test_connected_components_empty_graph():
+    g = HGraph()
+    assert connected_components(g) == []
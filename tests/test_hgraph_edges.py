@@ -48,3 +48,55 @@ def test_rm_edge(graph_with_edges):
     with pytest.raises(RuntimeError):
         graph_with_edges.rm_edge((0, 1), verify=True)
 
+
+def test_edges_cache(graph_with_edges):
+    """Test that cached edges follow graph modifications."""
+    edges = graph_with_edges.edges
+    edges.append((2, 0)) # returned list is a copy
+    assert graph_with_edges.edges == [(0, 1), (1, 2)]
+    graph_with_edges.rm_vx(0)
+    assert graph_with_edges.vertices == [1, 2]
+    assert graph_with_edges.edges == [(1, 2)]
+    graph_with_edges.add_edge(2, 1)
+    assert set(graph_with_edges.edges) == {(1, 2), (2, 1)}
+
+def test_edges_order_rm_vx(empty_graph):
+    """Test that edges stay grouped by ascending source vertex after removing a vertex."""
+    empty_graph.add_vx(5)
+    empty_graph.add_edge(0, [1, 3])
+    empty_graph.add_edge(1, 2)
+    empty_graph.add_edge(2, 4)
+    empty_graph.add_edge(3, 4)
+    empty_graph.add_edge(4, 0)
+    empty_graph.rm_vx(1)
+    assert empty_graph.edges == [(0, 3), (2, 4), (3, 4), (4, 0)]
+
+def test_add_edge_batch(empty_graph):
+    """Test that batch insertion ignores self-loops, duplicates and existing edges."""
+    empty_graph.add_vx(3)
+    assert empty_graph.add_edge(0, 1) == [(0, 1)]
+    assert empty_graph.add_edge([0, 0, 1], [1, 2, 0, 2]) == [(0, 2), (1, 2), (1, 0)]
+    assert empty_graph.num_edges == 4
+    assert empty_graph.out_vx(0) == [1, 2]
+    assert empty_graph.in_vx(2) == [0, 1]
+    with pytest.raises(RuntimeError):
+        empty_graph.add_edge(0, [1, 3])
+    assert empty_graph.num_edges == 4
+
+def test_copy_props(graph_with_edges):
+    """Test that copy() transfers vertex and edge properties."""
+    graph_with_edges.pmap[1]['name'] = 'b'
+    graph_with_edges.pmap[(1, 2)]['weight'] = [1]
+    (h, _map) = graph_with_edges.copy(vs=[1, 2], ret_map=True)
+    assert _map == {1: 0, 2: 1}
+    assert h.edges == [(0, 1)]
+    assert h.pmap[0] == {'name': 'b'}
+    assert h.pmap[(0, 1)] == {'weight': [1]}
+    assert h.pmap[(0, 1)]['weight'] is not graph_with_edges.pmap[(1, 2)]['weight']
+    h = graph_with_edges.copy(vs=[])
+    assert h.num_vx == 0
+
+def test_copy_invalid_vertex(graph_with_edges):
+    """Test that copy() raises on an unknown vertex."""
+    with pytest.raises(RuntimeError):
+        graph_with_edges.copy(vs=[0, 99])
@@ -70,3 +70,73 @@ def test_invalid_pattern_syntax():
 
     with pytest.raises(SyntaxError):
         QGraph(pattern='A =()> B')
+
+def test_processor_dfs_chain():
+    from heterograph import HGraph
+    from heterograph.query.processor_dfs import QueryProcessorDFS
+
+    g = HGraph()
+    g.add_vx(5)
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    g.add_edge(2, 3)
+    g.add_edge(1, 4)
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A => B => C'))
+    assert sorted((m['A'], m['B'], m['C']) for m in matches) == \
+       [(0, 1, 2), (0, 1, 3), (0, 1, 4), (0, 2, 3), (1, 2, 3)]
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A => B => C'), fd=1)
+    assert sorted((m['A'], m['B'], m['C']) for m in matches) == [(1, 2, 3)]
+
+def test_processor_dfs_dag():
+    from heterograph import HGraph
+    from heterograph.query.processor_dfs import QueryProcessorDFS
+
+    # diamond: vertex 3 is shared by 1 and 2, and its matches are repeated
+    g = HGraph()
+    g.add_vx(4)
+    g.add_edge(0, [1, 2])
+    g.add_edge(1, 3)
+    g.add_edge(2, 3)
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A'))
+    assert [m['A'] for m in matches] == [3, 1, 3, 2, 0]
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A => B'))
+    assert [(m['A'], m['B']) for m in matches] == \
+       [(1, 3), (2, 3), (0, 3), (0, 1), (0, 3), (0, 2)]
+
+    g.add_edge(3, 0)
+    with pytest.raises(RuntimeError):
+        QueryProcessorDFS().run(g, QGraph(pattern='A'), vs=[0])
+
+def test_processor_dfs_dag_depth():
+    from heterograph import HGraph
+    from heterograph.query.processor_dfs import QueryProcessorDFS
+
+    # depths are not monotone on DAGs: 1 (depth 1) is also reached through 4 (depth 3)
+    g = HGraph()
+    g.add_vx(5)
+    g.add_edge(0, [1, 2])
+    g.add_edge(2, 3)
+    g.add_edge(3, 4)
+    g.add_edge(4, 1)
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A => B'), gd=(0, 2))
+    assert [(m['A'], m['B']) for m in matches] == \
+       [(3, 1), (2, 1), (2, 3), (0, 1), (0, 1), (0, 3), (0, 2)]
+
+    matches = QueryProcessorDFS().run(g, QGraph(pattern='A => B'), fd=1, gd=(0, 2))
+    assert [(m['A'], m['B']) for m in matches] == [(2, 1), (2, 3)]
+
+def test_qgraph_paths_cache():
+    qg = QGraph(pattern='A => B; A => C')
+    assert qg.paths == [(0, 1), (0, 2)]
+
+    qg.out_vx(0, order=[2, 1])
+    assert qg.paths == [(0, 2), (0, 1)]
+
+    v = qg.add_vx()
+    qg.add_edge(1, v)
+    assert qg.paths == [(0, 2), (0, 1, v)]
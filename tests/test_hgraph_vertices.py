@@ -40,6 +40,19 @@ def test_sink(empty_graph, graph_with_vertices):
     graph_with_vertices.add_edge(0, [1, 2])
     assert graph_with_vertices.sink == [1, 2]
 
+def test_source_sink_update(graph_with_vertices):
+    """Test that source and sink follow edge and vertex removal."""
+    graph_with_vertices.add_edge(0, 1)
+    graph_with_vertices.add_edge(1, 2)
+    assert graph_with_vertices.source == [0]
+    assert graph_with_vertices.sink == [2]
+    graph_with_vertices.rm_edge((0, 1))
+    assert graph_with_vertices.source == [0, 1]
+    assert graph_with_vertices.sink == [0, 2]
+    graph_with_vertices.rm_vx(2)
+    assert graph_with_vertices.source == [0, 1]
+    assert graph_with_vertices.sink == [0, 1]
+
 def test_num_in_vx(graph_with_vertices):
     """Test the num_in_vx method."""
     graph_with_vertices.add_edge(0, 1)
@@ -64,9 +77,37 @@ def test_rm_vx(graph_with_vertices):
     assert graph_with_vertices.num_vx == 2
     assert graph_with_vertices.vertices == [0, 2]
 
+def test_rm_vx_props(graph_with_vertices):
+    """Test that rm_vx removes the properties of vertices and incident edges."""
+    graph_with_vertices.add_edge(0, [1, 2])
+    graph_with_vertices.pmap[0]['name'] = 'a'
+    graph_with_vertices.pmap[(0, 2)]['weight'] = 1
+    graph_with_vertices.rm_vx(0)
+    assert graph_with_vertices.pmap.vx == {}
+    assert graph_with_vertices.pmap.eg == {}
+    assert graph_with_vertices.source == [1, 2]
+
+def test_pmap_bool_key(graph_with_vertices):
+    """Test that bool keys are not taken as vertex ids."""
+    with pytest.raises(KeyError):
+        graph_with_vertices.pmap[True]
+
 def test_check_vx(graph_with_vertices):
     """Test the check_vx method."""
     assert graph_with_vertices.check_vx(0) is True
     assert graph_with_vertices.check_vx(3) is False
     with pytest.raises(RuntimeError):
         graph_with_vertices.check_vx(3, verify=True)
+
+def test_remove_subgraph(empty_graph):
+    """Test that remove_subgraph removes every vertex reachable from the root."""
+    empty_graph.add_vx(7)
+    empty_graph.add_edge(0, [1, 2])
+    empty_graph.add_edge([1, 2], 3)
+    empty_graph.add_edge(3, 4)
+    empty_graph.add_edge([5, 6], 3)
+    empty_graph.remove_subgraph(1)
+    assert empty_graph.vertices == [0, 2, 5, 6]
+    assert empty_graph.edges == [(0, 2)]
+    with pytest.raises(RuntimeError):
+        empty_graph.remove_subgraph(1)